@@ -5,46 +5,118 @@ Tests all authentication flows and identifies issues
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+import asyncio
+import queue
+import threading
 import json
 import base64
 import time
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Reused for every token payload instead of rebuilding an encoder per call
+TOKEN_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Tokens are regenerated once they are within this many seconds of expiry
+TOKEN_TTL = 900
+TOKEN_REFRESH_MARGIN = 60
+
+# (connect, read) timeout applied to every request
+REQUEST_TIMEOUT = (3, 10)
+
+# Upload fixture, encoded once at import instead of on every upload
+TEST_FILE_BYTES = b"Account,Amount,Type\nSales,10000,Credit\nCash,10000,Debit"
+
+# (name, method, path, json, files, validator, success message)
+ENDPOINT_TESTS = [
+    ("Auth User Endpoint", "GET", "/api/auth/user", None, None,
+     lambda d: d.get("success") and d.get("user"),
+     "User data retrieved successfully"),
+    ("Trial Balance Endpoint", "POST", "/api/reports/trial-balance", {"period": "2025"}, None,
+     lambda d: {"entries", "totalDebits", "totalCredits"} <= d.keys(),
+     "Trial balance generated successfully"),
+    ("Dashboard Stats Endpoint", "GET", "/api/dashboard/stats", None, None,
+     None,
+     "Dashboard stats retrieved successfully"),
+    ("Document Upload Endpoint", "POST", "/api/documents/upload", None,
+     {'file': ('test_auth.csv', TEST_FILE_BYTES, 'text/csv')},
+     lambda d: d.get("document") and d.get("message"),
+     "Document uploaded successfully"),
+]
+
 class AuthenticationTester:
     def __init__(self):
         self.base_url = "http://localhost:5000"
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.1,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET", "DELETE"])
+            ),
+            pool_connections=4,
+            pool_maxsize=32
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.test_user = {
             "userId": "9e36c4db-56c4-4175-9962-7d103db2c1cd",
             "email": "testuser@example.com"
         }
         self.jwt_token = None
+        self._token_exp = 0
         self.results = []
+        self._log_q = queue.Queue()
+        threading.Thread(target=self._log_drain, daemon=True).start()
+    
+    def _log_drain(self):
+        """Record and print queued test results on a background thread"""
+        while True:
+            result = self._log_q.get()
+            try:
+                self.results.append(result)
+                status = "✅ PASS" if result["success"] else "❌ FAIL"
+                print(f"{status} {result['test']}: {result['details']}")
+            finally:
+                self._log_q.task_done()
     
     def log_test(self, test_name, success, details="", response_data=None):
         """Log test result"""
-        result = {
+        self._log_q.put({
             "test": test_name,
             "success": success,
             "details": details,
             "response_data": response_data,
             "timestamp": datetime.now().isoformat()
-        }
-        self.results.append(result)
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}: {details}")
+        })
     
     def generate_jwt_token(self):
         """Generate JWT token for testing"""
+        if self.jwt_token and time.time() < self._token_exp - TOKEN_REFRESH_MARGIN:
+            return True
+        
         try:
             # Create JWT payload
+            exp = int(time.time()) + TOKEN_TTL
             payload = {
                 "userId": self.test_user["userId"],
-                "email": self.test_user["email"]
+                "email": self.test_user["email"],
+                "exp": exp
             }
             
             # Encode as base64 (matching the current implementation)
-            token_data = json.dumps(payload)
-            self.jwt_token = base64.b64encode(token_data.encode()).decode()
+            token_bytes = TOKEN_ENCODER.encode(payload).encode("ascii")
+            self.jwt_token = base64.b64encode(token_bytes).decode("ascii")
+            self._token_exp = exp
+            self.session.headers["Authorization"] = f"Bearer {self.jwt_token}"
             
             self.log_test("JWT Token Generation", True, f"Generated token: {self.jwt_token[:50]}...")
             return True
@@ -53,129 +125,48 @@ class AuthenticationTester:
             self.log_test("JWT Token Generation", False, f"Error: {str(e)}")
             return False
     
-    def test_auth_user_endpoint(self):
-        """Test /api/auth/user endpoint"""
+    def _run_endpoint_test(self, name, method, path, json=None, files=None, validator=None,
+                           success_message="Request succeeded"):
+        """Issue an authenticated request and log the outcome of its validator"""
         if not self.jwt_token:
-            self.log_test("Auth User Endpoint", False, "No JWT token available")
+            self.log_test(name, False, "No JWT token available")
             return False
         
         try:
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(f"{self.base_url}/api/auth/user", headers=headers)
+            response = self.session.request(method, f"{self.base_url}{path}", json=json, files=files,
+                                            timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 data = response.json()
-                if data.get("success") and data.get("user"):
-                    self.log_test("Auth User Endpoint", True, "User data retrieved successfully", data)
+                if validator is None or validator(data):
+                    self.log_test(name, True, success_message, data)
                     return True
                 else:
-                    self.log_test("Auth User Endpoint", False, f"Invalid response format: {data}")
+                    self.log_test(name, False, f"Invalid response format: {data}")
                     return False
             else:
-                self.log_test("Auth User Endpoint", False, f"HTTP {response.status_code}: {response.text}")
+                self.log_test(name, False, f"HTTP {response.status_code}: {response.text}")
                 return False
                 
         except Exception as e:
-            self.log_test("Auth User Endpoint", False, f"Error: {str(e)}")
+            self.log_test(name, False, f"Error: {str(e)}")
             return False
     
-    def test_trial_balance_endpoint(self):
-        """Test /api/reports/trial-balance endpoint"""
-        if not self.jwt_token:
-            self.log_test("Trial Balance Endpoint", False, "No JWT token available")
-            return False
-        
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {"period": "2025"}
-            response = requests.post(f"{self.base_url}/api/reports/trial-balance", 
-                                   headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if "entries" in data and "totalDebits" in data and "totalCredits" in data:
-                    self.log_test("Trial Balance Endpoint", True, "Trial balance generated successfully", data)
-                    return True
-                else:
-                    self.log_test("Trial Balance Endpoint", False, f"Invalid response format: {data}")
-                    return False
-            else:
-                self.log_test("Trial Balance Endpoint", False, f"HTTP {response.status_code}: {response.text}")
-                return False
-                
-        except Exception as e:
-            self.log_test("Trial Balance Endpoint", False, f"Error: {str(e)}")
-            return False
+    async def _probe(self, client, method, endpoint):
+        """Issue a single unauthenticated request and return its status code"""
+        response = await client.request(method, endpoint)
+        return response.status_code
     
-    def test_dashboard_stats_endpoint(self):
-        """Test /api/dashboard/stats endpoint"""
-        if not self.jwt_token:
-            self.log_test("Dashboard Stats Endpoint", False, "No JWT token available")
-            return False
-        
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}",
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(f"{self.base_url}/api/dashboard/stats", headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.log_test("Dashboard Stats Endpoint", True, "Dashboard stats retrieved successfully", data)
-                return True
-            else:
-                self.log_test("Dashboard Stats Endpoint", False, f"HTTP {response.status_code}: {response.text}")
-                return False
-                
-        except Exception as e:
-            self.log_test("Dashboard Stats Endpoint", False, f"Error: {str(e)}")
-            return False
-    
-    def test_document_upload_endpoint(self):
-        """Test /api/documents/upload endpoint"""
-        if not self.jwt_token:
-            self.log_test("Document Upload Endpoint", False, "No JWT token available")
-            return False
-        
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.jwt_token}"
-            }
-            
-            # Create a test file
-            test_file_content = "Account,Amount,Type\nSales,10000,Credit\nCash,10000,Debit"
-            files = {
-                'file': ('test_auth.csv', test_file_content, 'text/csv')
-            }
-            
-            response = requests.post(f"{self.base_url}/api/documents/upload", 
-                                   headers=headers, files=files)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("document") and data.get("message"):
-                    self.log_test("Document Upload Endpoint", True, "Document uploaded successfully", data)
-                    return True
-                else:
-                    self.log_test("Document Upload Endpoint", False, f"Invalid response format: {data}")
-                    return False
-            else:
-                self.log_test("Document Upload Endpoint", False, f"HTTP {response.status_code}: {response.text}")
-                return False
-                
-        except Exception as e:
-            self.log_test("Document Upload Endpoint", False, f"Error: {str(e)}")
-            return False
+    async def _no_auth_sweep(self, endpoints):
+        """Fire all unauthenticated probes concurrently over one client"""
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0])
+        ) as client:
+            return await asyncio.gather(
+                *(self._probe(client, method, endpoint) for method, endpoint in endpoints),
+                return_exceptions=True
+            )
     
     def test_without_auth_token(self):
         """Test endpoints without authentication token"""
@@ -186,20 +177,18 @@ class AuthenticationTester:
             ("POST", "/api/documents/upload")
         ]
         
-        for method, endpoint in endpoints:
-            try:
-                if method == "GET":
-                    response = requests.get(f"{self.base_url}{endpoint}")
-                else:
-                    response = requests.post(f"{self.base_url}{endpoint}")
-                
-                if response.status_code == 401:
-                    self.log_test(f"No Auth Test - {endpoint}", True, "Correctly rejected unauthorized request")
-                else:
-                    self.log_test(f"No Auth Test - {endpoint}", False, f"Expected 401, got {response.status_code}")
-                    
-            except Exception as e:
-                self.log_test(f"No Auth Test - {endpoint}", False, f"Error: {str(e)}")
+        try:
+            status_codes = asyncio.run(self._no_auth_sweep(endpoints))
+        except Exception as e:
+            status_codes = [e] * len(endpoints)
+        
+        for (method, endpoint), status_code in zip(endpoints, status_codes):
+            if isinstance(status_code, Exception):
+                self.log_test(f"No Auth Test - {endpoint}", False, f"Error: {str(status_code)}")
+            elif status_code == 401:
+                self.log_test(f"No Auth Test - {endpoint}", True, "Correctly rejected unauthorized request")
+            else:
+                self.log_test(f"No Auth Test - {endpoint}", False, f"Expected 401, got {status_code}")
     
     def test_invalid_token(self):
         """Test with invalid JWT token"""
@@ -209,7 +198,8 @@ class AuthenticationTester:
                 "Content-Type": "application/json"
             }
             
-            response = requests.get(f"{self.base_url}/api/auth/user", headers=headers)
+            response = self.session.get(f"{self.base_url}/api/auth/user", headers=headers,
+                                        timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 401:
                 self.log_test("Invalid Token Test", True, "Correctly rejected invalid token")
@@ -226,17 +216,18 @@ class AuthenticationTester:
         
         # Test JWT token generation
         if not self.generate_jwt_token():
+            self._log_q.join()
             print("❌ Cannot proceed without JWT token")
             return
         
         # Test valid authentication
+        self._log_q.join()
         print("\n📝 Testing Valid Authentication:")
-        self.test_auth_user_endpoint()
-        self.test_trial_balance_endpoint()
-        self.test_dashboard_stats_endpoint()
-        self.test_document_upload_endpoint()
+        for test in ENDPOINT_TESTS:
+            self._run_endpoint_test(*test)
         
         # Test invalid authentication
+        self._log_q.join()
         print("\n🔒 Testing Invalid Authentication:")
         self.test_without_auth_token()
         self.test_invalid_token()
@@ -246,6 +237,7 @@ class AuthenticationTester:
     
     def generate_summary(self):
         """Generate test summary"""
+        self._log_q.join()
         print("\n" + "=" * 50)
         print("📊 TEST SUMMARY")
         print("=" * 50)
@@ -266,8 +258,12 @@ class AuthenticationTester:
                     print(f"  - {result['test']}: {result['details']}")
         
         # Save detailed results
-        with open("auth_test_results.json", "w") as f:
-            json.dump(self.results, f, indent=2)
+        if orjson is not None:
+            with open("auth_test_results.json", "wb") as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        else:
+            with open("auth_test_results.json", "w") as f:
+                json.dump(self.results, f, separators=(",", ":"))
         
         print(f"\n💾 Detailed results saved to auth_test_results.json")
 
@@ -4,8 +4,9 @@ Check P&L discrepancy between manual calculation and platform
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from collections import defaultdict
+import numpy as np
 
 # API configuration
 BASE_URL = "http://localhost:5000"
@@ -16,46 +17,64 @@ headers = {
     "Content-Type": "application/json"
 }
 
+# Shared keep-alive session so every call reuses pooled connections
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=32))
+
 def get_journal_entries():
     """Get all journal entries"""
-    response = requests.get(f"{BASE_URL}/api/journal-entries", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/api/journal-entries")
     if response.status_code == 200:
         return response.json()
     else:
         print(f"Error fetching journal entries: {response.status_code}")
         return []
 
+def aggregate_by_account(codes, debits, credits, n_groups):
+    """Sum debits and credits per account index in a single native pass"""
+    total_debits = np.bincount(codes, weights=debits, minlength=n_groups)
+    total_credits = np.bincount(codes, weights=credits, minlength=n_groups)
+    return total_debits, total_credits
+
 def analyze_account_balances():
     """Analyze account balances from journal entries"""
     entries = get_journal_entries()
     
-    # Group by account code
-    account_balances = defaultdict(lambda: {
-        'name': '',
-        'total_debits': 0,
-        'total_credits': 0,
-        'net_balance': 0
-    })
+    # Encode account codes as dense integer indexes
+    codebook = {}
+    names = []
+    codes = np.empty(len(entries), dtype=np.intp)
+    debits = np.empty(len(entries), dtype=np.float64)
+    credits = np.empty(len(entries), dtype=np.float64)
+    
+    for i, entry in enumerate(entries):
+        index = codebook.setdefault(entry['accountCode'], len(codebook))
+        if index == len(names):
+            names.append(entry['accountName'])
+        else:
+            names[index] = entry['accountName']
+        codes[i] = index
+        debits[i] = float(entry.get('debitAmount', 0) or 0)
+        credits[i] = float(entry.get('creditAmount', 0) or 0)
+    
+    total_debits, total_credits = aggregate_by_account(codes, debits, credits, len(codebook))
     
-    for entry in entries:
-        account_code = entry['accountCode']
-        account_name = entry['accountName']
-        debit_amount = float(entry.get('debitAmount', 0) or 0)
-        credit_amount = float(entry.get('creditAmount', 0) or 0)
-        
-        account_balances[account_code]['name'] = account_name
-        account_balances[account_code]['total_debits'] += debit_amount
-        account_balances[account_code]['total_credits'] += credit_amount
-        account_balances[account_code]['net_balance'] = (
-            account_balances[account_code]['total_debits'] - 
-            account_balances[account_code]['total_credits']
-        )
+    # Decode indexes back to account codes
+    account_balances = {}
+    for account_code, index in codebook.items():
+        account_balances[account_code] = {
+            'name': names[index],
+            'total_debits': float(total_debits[index]),
+            'total_credits': float(total_credits[index]),
+            'net_balance': float(total_debits[index] - total_credits[index])
+        }
     
     return account_balances
 
 def calculate_manual_pl():
     """Calculate P&L manually using proper accounting logic"""
-    balances = analyze_account_balances()
+    balances = sorted(analyze_account_balances().items())
     
     revenue_accounts = {}
     expense_accounts = {}
@@ -63,13 +82,8 @@ def calculate_manual_pl():
     total_revenue = 0
     total_expenses = 0
     
-    print("=== ACCOUNT ANALYSIS ===")
-    print(f"{'Account':<8} {'Name':<25} {'Debits':<12} {'Credits':<12} {'Net Balance':<12}")
-    print("-" * 80)
-    
-    for code, data in sorted(balances.items()):
-        print(f"{code:<8} {data['name'][:25]:<25} {data['total_debits']:<12,.0f} {data['total_credits']:<12,.0f} {data['net_balance']:<12,.0f}")
-        
+    # Phase 1: classify the aggregated balances
+    for code, data in balances:
         if code.startswith('4'):  # Revenue accounts
             # For revenue accounts, credit balance is revenue
             amount = data['total_credits']
@@ -90,6 +104,14 @@ def calculate_manual_pl():
                 }
                 total_expenses += amount
     
+    # Phase 2: report
+    print("=== ACCOUNT ANALYSIS ===")
+    print(f"{'Account':<8} {'Name':<25} {'Debits':<12} {'Credits':<12} {'Net Balance':<12}")
+    print("-" * 80)
+    
+    for code, data in balances:
+        print(f"{code:<8} {data['name'][:25]:<25} {data['total_debits']:<12,.0f} {data['total_credits']:<12,.0f} {data['net_balance']:<12,.0f}")
+    
     print(f"\n=== REVENUE ACCOUNTS ===")
     for code, data in revenue_accounts.items():
         print(f"{code}: {data['name']} - ₹{data['amount']:,.0f}")
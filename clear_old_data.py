@@ -4,6 +4,7 @@ Clear old data from the database for fresh testing
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
 
@@ -16,6 +17,11 @@ headers = {
     "Content-Type": "application/json"
 }
 
+# Shared keep-alive session so every call reuses pooled connections
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=32))
+
 def clear_all_data():
     """Clear all existing data from the database"""
     print("Clearing all existing data...")
@@ -23,13 +29,13 @@ def clear_all_data():
     # Clear journal entries
     print("1. Clearing journal entries...")
     try:
-        response = requests.get(f"{BASE_URL}/api/journal-entries", headers=headers)
+        response = SESSION.get(f"{BASE_URL}/api/journal-entries")
         if response.status_code == 200:
             entries = response.json()
             print(f"   Found {len(entries)} journal entries to delete")
             
             for entry in entries:
-                delete_response = requests.delete(f"{BASE_URL}/api/journal-entries/{entry['id']}", headers=headers)
+                delete_response = SESSION.delete(f"{BASE_URL}/api/journal-entries/{entry['id']}")
                 if delete_response.status_code == 200:
                     print(f"   ✓ Deleted journal entry {entry['id']}")
                 else:
@@ -42,13 +48,13 @@ def clear_all_data():
     # Clear financial statements
     print("\n2. Clearing financial statements...")
     try:
-        response = requests.get(f"{BASE_URL}/api/financial-statements", headers=headers)
+        response = SESSION.get(f"{BASE_URL}/api/financial-statements")
         if response.status_code == 200:
             statements = response.json()
             print(f"   Found {len(statements)} financial statements to delete")
             
             for statement in statements:
-                delete_response = requests.delete(f"{BASE_URL}/api/financial-statements/{statement['id']}", headers=headers)
+                delete_response = SESSION.delete(f"{BASE_URL}/api/financial-statements/{statement['id']}")
                 if delete_response.status_code == 200:
                     print(f"   ✓ Deleted financial statement {statement['id']}")
                 else:
@@ -61,13 +67,13 @@ def clear_all_data():
     # Clear documents (optional - keep if you want to keep uploaded files)
     print("\n3. Clearing documents...")
     try:
-        response = requests.get(f"{BASE_URL}/api/documents", headers=headers)
+        response = SESSION.get(f"{BASE_URL}/api/documents")
         if response.status_code == 200:
             documents = response.json()
             print(f"   Found {len(documents)} documents to delete")
             
             for doc in documents:
-                delete_response = requests.delete(f"{BASE_URL}/api/documents/{doc['id']}", headers=headers)
+                delete_response = SESSION.delete(f"{BASE_URL}/api/documents/{doc['id']}")
                 if delete_response.status_code == 200:
                     print(f"   ✓ Deleted document {doc['originalName']}")
                 else:
@@ -7,14 +7,106 @@ Orchestrates all testing phases: unit tests, integration tests, and end-to-end t
 import sys
 import os
 import json
+import asyncio
 import time
+import statistics
 import subprocess
+import tempfile
+import importlib.util
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the current directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Serve the test app on a Unix domain socket where available, skipping the TCP stack
+USE_UDS = sys.platform != 'win32'
+SOCKET_PATH = os.path.join(tempfile.gettempdir(), "qrt-closure-test.sock")
+
+# Authentication probes: (name, method, path, headers, json body, expected status)
+_SEC_TESTS = (
+    ('Invalid token access', 'GET', '/api/auth/user',
+     {"Authorization": "Bearer invalid_token"}, None, 401),
+    ('Missing authentication', 'GET', '/api/dashboard/stats',
+     None, None, 401),
+    ('SQL injection prevention', 'POST', '/api/auth/login',
+     None, {"email": "'; DROP TABLE users; --", "password": "test"}, 422),
+)
+
+@functools.lru_cache(maxsize=None)
+def _get_db_fn():
+    """Import the app's database layer on first use only"""
+    from app.database import get_db
+    import app.models  # registers the ORM models
+    return get_db
+
+def _fast_server_args():
+    """Select uvloop/httptools for the test server when they are installed"""
+    args = []
+    if importlib.util.find_spec("uvloop") is not None:
+        args += ["--loop", "uvloop"]
+    if importlib.util.find_spec("httptools") is not None:
+        args += ["--http", "httptools"]
+    return args
+
+def _timed_suite(result_key):
+    """Record the wrapped suite's own wall time in test_results[result_key]"""
+    def decorator(func):
+        def record(self, start):
+            if self.test_results.get(result_key) is not None:
+                self.test_results[result_key]['duration'] = time.perf_counter() - start
+        
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(self, *args, **kwargs)
+                finally:
+                    record(self, start)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                record(self, start)
+        return wrapper
+    return decorator
+
+def _run_child(script, timeout):
+    """Run a test script in a child interpreter"""
+    # Output goes straight to temp files so a chatty child never blocks on a full
+    # pipe; it is only read back when the script fails.
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        # close_fds=False (and no preexec_fn) lets CPython use os.posix_spawn
+        result = subprocess.run(
+            [sys.executable, script],
+            stdout=out,
+            stderr=err,
+            timeout=timeout,
+            close_fds=False
+        )
+        
+        result.stdout = result.stderr = ""
+        if result.returncode != 0:
+            out.seek(0)
+            err.seek(0)
+            result.stdout = out.read().decode(errors="replace")
+            result.stderr = err.read().decode(errors="replace")
+        return result
+
 class CompleteTestRunner:
     """Comprehensive test runner for the entire QRT Closure platform"""
     
@@ -26,41 +118,71 @@ class CompleteTestRunner:
             'performance_tests': None
         }
         self.start_time = time.time()
+        self._proc_pool = ThreadPoolExecutor(max_workers=2)
+        self._child_runs = {}
+        # One pooled client shared by every HTTP call the runner makes
+        limits = httpx.Limits(max_connections=64, keepalive_expiry=30)
+        self._http = httpx.AsyncClient(
+            base_url="http://localhost:8000",
+            transport=httpx.AsyncHTTPTransport(uds=SOCKET_PATH, limits=limits) if USE_UDS else None,
+            timeout=5.0,
+            limits=limits
+        )
         
         print("🎯 QRT Closure Platform - Complete Testing Suite")
         print("=" * 70)
         print("Running comprehensive tests across all platform components")
         print("=" * 70)
     
-    def run_python_server(self):
+    async def run_python_server(self):
         """Start Python FastAPI server for testing"""
         print("\n🚀 Starting Python FastAPI server...")
         
         try:
+            if USE_UDS:
+                if os.path.exists(SOCKET_PATH):
+                    os.unlink(SOCKET_PATH)
+                bind_args = ["--uds", SOCKET_PATH]
+            else:
+                bind_args = ["--host", "0.0.0.0", "--port", "8000"]
+            
             # Start server in background
             server_process = subprocess.Popen(
-                [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                [sys.executable, "-m", "uvicorn", "main:app", *bind_args,
+                 *_fast_server_args(), "--workers", "1", "--no-access-log"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
             )
             
-            # Wait for server to start
-            time.sleep(5)
-            
-            # Test server health
-            import requests
-            response = requests.get("http://localhost:8000/api/health", timeout=10)
-            if response.status_code == 200:
-                print("✓ Python server started successfully")
-                return server_process
-            else:
-                print("✗ Python server failed to start properly")
-                return None
+            # Poll server health until it answers instead of sleeping a fixed interval
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                if USE_UDS and not os.path.exists(SOCKET_PATH):
+                    await asyncio.sleep(0.1)
+                    continue
+                try:
+                    response = await self._http.get("/api/health", timeout=0.5)
+                    if response.status_code == 200:
+                        print("✓ Python server started successfully")
+                        return server_process
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+            
+            print("✗ Python server failed to start properly")
+            return None
                 
         except Exception as e:
             print(f"✗ Error starting Python server: {e}")
             return None
     
+    def _start_child(self, script, timeout):
+        """Launch a test script on the shared pool unless it is already running"""
+        if script not in self._child_runs:
+            self._child_runs[script] = self._proc_pool.submit(_run_child, script, timeout)
+        return self._child_runs[script]
+    
+    @_timed_suite('unit_tests')
     def run_unit_tests(self):
         """Run unit tests for all components"""
         print("\n🧪 Running Unit Tests...")
@@ -68,19 +190,13 @@ class CompleteTestRunner:
         
         try:
             # Run Python unit tests
-            result = subprocess.run(
-                [sys.executable, "test_fastapi_app.py"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
+            result = self._start_child("test_fastapi_app.py", 300).result()
             
             success = result.returncode == 0
             self.test_results['unit_tests'] = {
                 'success': success,
                 'stdout': result.stdout,
-                'stderr': result.stderr,
-                'duration': time.time() - self.start_time
+                'stderr': result.stderr
             }
             
             if success:
@@ -98,25 +214,20 @@ class CompleteTestRunner:
             print(f"✗ Error running unit tests: {e}")
             return False
     
+    @_timed_suite('integration_tests')
     def run_integration_tests(self):
         """Run integration tests"""
         print("\n🔗 Running Integration Tests...")
         print("-" * 50)
         
         try:
-            result = subprocess.run(
-                [sys.executable, "integration_test.py"],
-                capture_output=True,
-                text=True,
-                timeout=600
-            )
+            result = self._start_child("integration_test.py", 600).result()
             
             success = result.returncode == 0
             self.test_results['integration_tests'] = {
                 'success': success,
                 'stdout': result.stdout,
-                'stderr': result.stderr,
-                'duration': time.time() - self.start_time
+                'stderr': result.stderr
             }
             
             if success:
@@ -134,17 +245,44 @@ class CompleteTestRunner:
             print(f"✗ Error running integration tests: {e}")
             return False
     
-    def run_performance_tests(self):
+    async def _perf_once(self, url):
+        """Time a single load-test request"""
+        start_ns = time.perf_counter_ns()
+        try:
+            if url.endswith('/login'):
+                response = await self._http.post(url, json={
+                    "email": "demo@example.com",
+                    "password": "DemoPassword123!"
+                })
+            else:
+                response = await self._http.get(url)
+            
+            return response.status_code < 400, (time.perf_counter_ns() - start_ns) / 1e9
+            
+        except Exception:
+            return False, 5.0  # Timeout
+    
+    async def _run_load(self, endpoints, requests_per_endpoint, concurrency=10):
+        """Issue every load-test request on one event loop, at most `concurrency` at a time"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def guarded(endpoint):
+            async with semaphore:
+                return await self._perf_once(endpoint)
+        
+        return await asyncio.gather(*(
+            guarded(endpoint)
+            for _ in range(requests_per_endpoint)
+            for endpoint in endpoints
+        ))
+    
+    @_timed_suite('performance_tests')
+    async def run_performance_tests(self):
         """Run performance and load tests"""
         print("\n⚡ Running Performance Tests...")
         print("-" * 50)
         
         try:
-            # Import performance testing modules
-            import requests
-            import threading
-            from concurrent.futures import ThreadPoolExecutor
-            
             # Test endpoints
             endpoints = [
                 "/api/health",
@@ -152,49 +290,14 @@ class CompleteTestRunner:
                 "/api/dashboard/stats"
             ]
             
-            # Performance metrics
-            response_times = []
-            success_count = 0
-            total_requests = 0
-            
-            def make_request(url):
-                nonlocal success_count, total_requests
-                start_time = time.time()
-                try:
-                    if url.endswith('/login'):
-                        response = requests.post(f"http://localhost:8000{url}", json={
-                            "email": "demo@example.com",
-                            "password": "DemoPassword123!"
-                        }, timeout=5)
-                    else:
-                        response = requests.get(f"http://localhost:8000{url}", timeout=5)
-                    
-                    response_time = time.time() - start_time
-                    response_times.append(response_time)
-                    
-                    if response.status_code < 400:
-                        success_count += 1
-                    
-                    total_requests += 1
-                    
-                except Exception as e:
-                    total_requests += 1
-                    response_times.append(5.0)  # Timeout
-            
-            # Run concurrent requests
-            with ThreadPoolExecutor(max_workers=10) as executor:
-                futures = []
-                for _ in range(50):  # 50 requests per endpoint
-                    for endpoint in endpoints:
-                        future = executor.submit(make_request, endpoint)
-                        futures.append(future)
-                
-                # Wait for all requests to complete
-                for future in futures:
-                    future.result()
+            # Run concurrent requests, 50 per endpoint
+            results = await self._run_load(endpoints, 50)
             
             # Calculate metrics
-            avg_response_time = sum(response_times) / len(response_times)
+            response_times = [elapsed for _, elapsed in results]
+            total_requests = len(results)
+            success_count = sum(1 for ok, _ in results if ok)
+            avg_response_time = statistics.fmean(response_times)
             success_rate = (success_count / total_requests) * 100
             
             performance_result = {
@@ -208,8 +311,7 @@ class CompleteTestRunner:
             
             self.test_results['performance_tests'] = {
                 'success': success_rate > 95,  # 95% success rate threshold
-                'metrics': performance_result,
-                'duration': time.time() - self.start_time
+                'metrics': performance_result
             }
             
             print(f"✓ Performance tests completed")
@@ -229,26 +331,28 @@ class CompleteTestRunner:
         print("-" * 50)
         
         try:
-            from app.database import get_db
-            from app.models import User, Document, UserSession
             from sqlalchemy import text
             
-            db = next(get_db())
+            db = next(_get_db_fn()())
             
             # Test database connectivity
             result = db.execute(text("SELECT 1")).fetchone()
             if result[0] != 1:
                 raise Exception("Database connectivity test failed")
             
-            # Test table existence
+            # Test table existence and count test users in a single round-trip
             tables = ['users', 'user_sessions', 'documents']
+            count_sql = " UNION ALL ".join(
+                [f"SELECT '{table}' AS t, COUNT(*) AS c FROM {table}" for table in tables]
+                + ["SELECT 'test_users' AS t, COUNT(*) AS c FROM users WHERE email LIKE 'test_%'"]
+            )
+            counts = dict(db.execute(text(count_sql)).fetchall())
+            
             for table in tables:
-                result = db.execute(text(f"SELECT COUNT(*) FROM {table}")).fetchone()
-                print(f"  - Table {table}: {result[0]} records")
+                print(f"  - Table {table}: {counts[table]} records")
             
             # Test user creation and retrieval
-            test_user_count = db.execute(text("SELECT COUNT(*) FROM users WHERE email LIKE 'test_%'")).fetchone()[0]
-            print(f"  - Test users in database: {test_user_count}")
+            print(f"  - Test users in database: {counts['test_users']}")
             
             print("✓ Database tests completed successfully")
             return True
@@ -257,50 +361,34 @@ class CompleteTestRunner:
             print(f"✗ Database tests failed: {e}")
             return False
     
-    def run_security_tests(self):
+    async def _run_probes(self, security_tests):
+        """Send every security probe concurrently over one client"""
+        return await asyncio.gather(
+            *(self._http.request(method, path, headers=headers, json=body)
+              for _, method, path, headers, body, _ in security_tests),
+            return_exceptions=True
+        )
+    
+    async def run_security_tests(self):
         """Run security and authentication tests"""
         print("\n🔒 Running Security Tests...")
         print("-" * 50)
         
         try:
-            import requests
-            
-            # Test authentication endpoints
-            security_tests = [
-                {
-                    'name': 'Invalid token access',
-                    'request': lambda: requests.get("http://localhost:8000/api/auth/user", 
-                                                  headers={"Authorization": "Bearer invalid_token"}),
-                    'expected_status': 401
-                },
-                {
-                    'name': 'Missing authentication',
-                    'request': lambda: requests.get("http://localhost:8000/api/dashboard/stats"),
-                    'expected_status': 401
-                },
-                {
-                    'name': 'SQL injection prevention',
-                    'request': lambda: requests.post("http://localhost:8000/api/auth/login", 
-                                                    json={"email": "'; DROP TABLE users; --", 
-                                                         "password": "test"}),
-                    'expected_status': 422
-                }
-            ]
+            responses = await self._run_probes(_SEC_TESTS)
             
             passed_tests = 0
-            for test in security_tests:
-                try:
-                    response = test['request']()
-                    if response.status_code == test['expected_status']:
-                        print(f"  ✓ {test['name']}")
-                        passed_tests += 1
-                    else:
-                        print(f"  ✗ {test['name']} - Expected {test['expected_status']}, got {response.status_code}")
-                except Exception as e:
-                    print(f"  ✗ {test['name']} - Error: {e}")
-            
-            success = passed_tests == len(security_tests)
-            print(f"✓ Security tests completed: {passed_tests}/{len(security_tests)} passed")
+            for (name, _, _, _, _, expected_status), response in zip(_SEC_TESTS, responses):
+                if isinstance(response, Exception):
+                    print(f"  ✗ {name} - Error: {response}")
+                elif response.status_code == expected_status:
+                    print(f"  ✓ {name}")
+                    passed_tests += 1
+                else:
+                    print(f"  ✗ {name} - Expected {expected_status}, got {response.status_code}")
+            
+            success = passed_tests == len(_SEC_TESTS)
+            print(f"✓ Security tests completed: {passed_tests}/{len(_SEC_TESTS)} passed")
             return success
             
         except Exception as e:
@@ -359,24 +447,40 @@ class CompleteTestRunner:
                         print(f"    {key}: {value}")
         
         # Save comprehensive report
-        with open('COMPREHENSIVE_TEST_REPORT.json', 'w') as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            with open('COMPREHENSIVE_TEST_REPORT.json', 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open('COMPREHENSIVE_TEST_REPORT.json', 'w') as f:
+                json.dump(report, f, indent=2)
         
         print('\n📄 Comprehensive report saved to COMPREHENSIVE_TEST_REPORT.json')
         return passed_tests == total_tests
     
-    def run_all_tests(self):
+    async def _run_suite(self, suite_name, test_func):
+        """Await an async suite directly, or run a blocking one on a worker thread"""
+        print(f"\n{'='*20} {suite_name} {'='*20}")
+        if asyncio.iscoroutinefunction(test_func):
+            return await test_func()
+        return await asyncio.to_thread(test_func)
+    
+    async def run_all_tests(self):
         """Run all test suites"""
         print(f"\n🎯 Starting comprehensive testing at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Start Python server
-        server_process = self.run_python_server()
+        server_process = await self.run_python_server()
         if not server_process:
             print("❌ Cannot proceed without Python server")
+            await self._http.aclose()
             return False
         
         try:
-            # Run all test suites
+            # Start both child-process suites up front so they overlap
+            self._start_child("test_fastapi_app.py", 300)
+            self._start_child("integration_test.py", 600)
+            
+            # Run all test suites concurrently; they share only the server
             test_suites = [
                 ("Database Tests", self.run_database_tests),
                 ("Security Tests", self.run_security_tests),
@@ -385,11 +489,14 @@ class CompleteTestRunner:
                 ("Performance Tests", self.run_performance_tests)
             ]
             
+            results = await asyncio.gather(
+                *(self._run_suite(suite_name, test_func) for suite_name, test_func in test_suites),
+                return_exceptions=True
+            )
+            
             all_passed = True
-            for suite_name, test_func in test_suites:
-                print(f"\n{'='*20} {suite_name} {'='*20}")
-                result = test_func()
-                if not result:
+            for (suite_name, _), result in zip(test_suites, results):
+                if isinstance(result, Exception) or not result:
                     all_passed = False
                     print(f"❌ {suite_name} failed")
                 else:
@@ -406,6 +513,9 @@ class CompleteTestRunner:
             return final_result
             
         finally:
+            await self._http.aclose()
+            self._proc_pool.shutdown(wait=True)
+            
             # Clean up server process
             if server_process:
                 server_process.terminate()
@@ -414,10 +524,10 @@ class CompleteTestRunner:
 
 if __name__ == "__main__":
     runner = CompleteTestRunner()
-    success = runner.run_all_tests()
+    success = asyncio.run(runner.run_all_tests())
     
     if success:
         print("\n🚀 Platform is ready for deployment!")
     else:
         print("\n🔧 Platform needs fixes before deployment.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
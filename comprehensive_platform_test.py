@@ -4,61 +4,119 @@ Comprehensive Platform Test Suite - Final Validation
 Tests all working platform components and functionality
 """
 
-import requests
-import json
+import httpx
 import time
-from datetime import datetime
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-class ComprehensivePlatformTest:
+from platform_test_base import BaseRunner, decode_json, write_json_report
+
+# 2s to connect, 10s for everything else
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+
+class ComprehensivePlatformTest(BaseRunner):
     def __init__(self):
-        self.base_url = "http://localhost:5000"
-        self.test_results = []
+        super().__init__()
+        self._log_lines = []
         self.auth_token = None
         self.user_id = None
         self.tenant_id = None
+        # One thread-safe client for the serial tests and the pooled batch; failed
+        # connects are retried, which is safe for every method
+        limits = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+        self.s = httpx.Client(base_url=self.base_url, timeout=REQUEST_TIMEOUT,
+                              transport=httpx.HTTPTransport(retries=2, limits=limits))
+        # path -> (ETag, parsed body) for conditional re-fetches
+        self._etag_cache = {}
+        # Documents are shared by several tests; the pooled tests may ask for them concurrently
+        self._memo_lock = threading.Lock()
+        self._docs = None
+        
+        # Open the first pooled connection now so no timed test pays for connection setup
+        try:
+            self.s.head("/", timeout=1)
+        except httpx.HTTPError:
+            pass
         
     def log_test(self, test_name: str, passed: bool, details: str = "", duration: float = 0):
         """Log test result with timestamp"""
-        result = {
-            "test_name": test_name,
-            "passed": passed,
-            "details": details,
-            "duration": duration,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.test_results.append(result)
+        self.record_result(test_name, passed=passed, details=details, duration=duration)
         status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status} {test_name} ({duration:.2f}s)")
+        self._log_lines.append(f"{status} {test_name} ({duration:.2f}s)")
         if details:
-            print(f"   Details: {details}")
-        
-    def run_test(self, test_name: str, test_func):
-        """Run test with error handling and timing"""
-        start_time = time.time()
+            self._log_lines.append(f"   Details: {details}")
+        
+    def _get_json(self, path: str, headers=None):
+        """GET a JSON endpoint, revalidating a previously seen body with If-None-Match"""
+        cached = self._etag_cache.get(path)
+        headers = dict(headers or {})
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        
+        response = self.s.get(path, headers=headers)
+        if response.status_code == 304 and cached:
+            return 200, cached[1]
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        data = decode_json(response)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[path] = (etag, data)
+        return 200, data
+        
+    def _count(self, path: str):
+        """Count a collection from HEAD's X-Total-Count, without downloading it"""
+        response = self.s.head(path)
+        total = response.headers.get("X-Total-Count")
+        if response.status_code == 200 and total is not None:
+            return int(total)
+        return None
+        
+    def _documents(self):
+        """Return the /api/documents list, fetched at most once per run"""
+        with self._memo_lock:
+            if self._docs is None:
+                status, documents = self._get_json("/api/documents")
+                if status == 200:
+                    self._docs = documents
+            return self._docs
+        
+    def _timed(self, test_func):
+        """Run test_func, returning (result, error, duration) without logging"""
+        start_ns = time.perf_counter_ns()
         try:
             result = test_func()
-            duration = time.time() - start_time
-            if result:
-                self.log_test(test_name, True, str(result), duration)
-            else:
-                self.log_test(test_name, False, "Test returned False", duration)
+            return result, None, (time.perf_counter_ns() - start_ns) / 1e9
         except Exception as e:
-            duration = time.time() - start_time
-            self.log_test(test_name, False, str(e), duration)
+            return None, e, (time.perf_counter_ns() - start_ns) / 1e9
+            
+    def _record(self, test_name: str, result, error, duration: float):
+        """Log the outcome of a timed test"""
+        if error is not None:
+            self.log_test(test_name, False, str(error), duration)
+        elif result:
+            self.log_test(test_name, True, str(result), duration)
+        else:
+            self.log_test(test_name, False, "Test returned False", duration)
+            
+    def run_test(self, test_name: str, test_func):
+        """Run test with error handling and timing"""
+        self._record(test_name, *self._timed(test_func))
             
     def test_authentication(self):
         """Test authentication system"""
         # Use existing demo user
         token = "eyJ1c2VySWQiOiI2cE11RHFxNW5uUG10Mkl3enVWbGIiLCJlbWFpbCI6InNoaXYuZGFzQHBhdHRlcm5lZmZlY3RzbGFicy5jb20ifQ=="
         
-        response = requests.get(f"{self.base_url}/api/auth/user", 
-                              headers={"Authorization": f"Bearer {token}"})
+        auth_header = {"Authorization": f"Bearer {token}"}
+        status, user_data = self._get_json("/api/auth/user", headers=auth_header)
         
-        if response.status_code == 200:
-            user_data = response.json()
+        if status == 200:
             self.auth_token = token
+            self.s.headers.update(auth_header)
             self.user_id = user_data["user"]["id"]
             self.tenant_id = user_data["user"].get("tenant_id")
             return f"User authenticated: {user_data['user']['email']}"
@@ -67,41 +125,32 @@ class ComprehensivePlatformTest:
             
     def test_document_management(self):
         """Test document management system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Get documents
-        response = requests.get(f"{self.base_url}/api/documents", headers=headers)
+        documents = self._documents()
         
-        if response.status_code == 200:
-            documents = response.json()
+        if documents is not None:
             return f"Found {len(documents)} documents"
         else:
             return False
             
     def test_journal_entries(self):
         """Test journal entry system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Get journal entries
-        response = requests.get(f"{self.base_url}/api/journal-entries", headers=headers)
+        status, entries = self._get_json("/api/journal-entries")
         
-        if response.status_code == 200:
-            entries = response.json()
+        if status == 200:
             return f"Found {len(entries)} journal entries"
         else:
             return False
             
     def test_financial_reports(self):
         """Test financial reporting system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Test trial balance
-        response = requests.post(f"{self.base_url}/api/reports/trial-balance", 
-                               headers=headers, 
+        response = self.s.post("/api/reports/trial-balance", 
                                json={"period": "2025"})
         
         if response.status_code == 200:
-            trial_balance = response.json()
+            trial_balance = decode_json(response)
             if "entries" in trial_balance:
                 return f"Trial Balance: {len(trial_balance['entries'])} entries"
             else:
@@ -111,80 +160,62 @@ class ComprehensivePlatformTest:
             
     def test_compliance_reports(self):
         """Test compliance reporting system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
-        # Get compliance checks
-        response = requests.get(f"{self.base_url}/api/compliance-checks", headers=headers)
+        # Count compliance checks
+        total = self._count("/api/compliance-checks")
         
-        if response.status_code == 200:
-            checks = response.json()
-            return f"Found {len(checks)} compliance checks"
+        if total is not None:
+            return f"Found {total} compliance checks"
         else:
             return False
             
     def test_financial_statements(self):
         """Test financial statements system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Get financial statements
-        response = requests.get(f"{self.base_url}/api/financial-statements", headers=headers)
+        status, statements = self._get_json("/api/financial-statements")
         
-        if response.status_code == 200:
-            statements = response.json()
+        if status == 200:
             return f"Found {len(statements)} financial statements"
         else:
             return False
             
     def test_dashboard_stats(self):
         """Test dashboard statistics"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Get dashboard stats
-        response = requests.get(f"{self.base_url}/api/dashboard/stats", headers=headers)
+        status, stats = self._get_json("/api/dashboard/stats")
         
-        if response.status_code == 200:
-            stats = response.json()
+        if status == 200:
             return f"Dashboard stats: {stats.get('documentsProcessed', 0)} documents processed"
         else:
             return False
             
     def test_audit_trail(self):
         """Test audit trail system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
+        # Count audit trail entries
+        total = self._count("/api/audit-trail")
         
-        # Get audit trail
-        response = requests.get(f"{self.base_url}/api/audit-trail", headers=headers)
-        
-        if response.status_code == 200:
-            audit_entries = response.json()
-            return f"Found {len(audit_entries)} audit entries"
+        if total is not None:
+            return f"Found {total} audit entries"
         else:
             return False
             
     def test_chat_system(self):
         """Test conversational AI chat system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Test chat query
-        response = requests.post(f"{self.base_url}/api/chat/query", 
-                               headers=headers, 
+        response = self.s.post("/api/chat/query", 
                                json={"query": "What is my current financial status?"})
         
         if response.status_code == 200:
-            chat_result = response.json()
+            chat_result = decode_json(response)
             return f"Chat query successful: {chat_result.get('success', False)}"
         else:
             return False
             
     def test_classification_system(self):
         """Test document classification system"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         # Get documents to check classification
-        response = requests.get(f"{self.base_url}/api/documents", headers=headers)
+        documents = self._documents()
         
-        if response.status_code == 200:
-            documents = response.json()
+        if documents is not None:
             classified_docs = [doc for doc in documents if doc.get("documentType")]
             return f"Classification: {len(classified_docs)}/{len(documents)} documents classified"
         else:
@@ -192,8 +223,6 @@ class ComprehensivePlatformTest:
             
     def test_api_performance(self):
         """Test API performance with multiple requests"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
         endpoints = [
             "/api/auth/user",
             "/api/documents",
@@ -202,40 +231,37 @@ class ComprehensivePlatformTest:
             "/api/dashboard/stats"
         ]
         
-        successful_requests = 0
         total_requests = len(endpoints)
         
-        for endpoint in endpoints:
-            response = requests.get(f"{self.base_url}{endpoint}", headers=headers)
-            if response.status_code == 200:
-                successful_requests += 1
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(self.s.get, endpoints))
+        successful_requests = sum(1 for response in responses if response.status_code == 200)
                 
         success_rate = (successful_requests / total_requests) * 100
         return f"{successful_requests}/{total_requests} requests successful ({success_rate:.1f}%)"
         
     def test_data_integrity(self):
         """Test data integrity across different endpoints"""
-        headers = {"Authorization": f"Bearer {self.auth_token}"}
-        
-        # Get user info
-        user_response = requests.get(f"{self.base_url}/api/auth/user", headers=headers)
-        if user_response.status_code != 200:
+        # Reuse the user and documents already fetched earlier in the run
+        if not self.user_id:
             return False
             
-        user_data = user_response.json()
-        expected_user_id = user_data["user"]["id"]
-        
-        # Check documents are filtered by user
-        docs_response = requests.get(f"{self.base_url}/api/documents", headers=headers)
-        if docs_response.status_code != 200:
+        documents = self._documents()
+        if documents is None:
             return False
             
-        return f"User ID consistent: {expected_user_id[:8]}..."
+        # Documents are tenant-scoped, so none may belong to another tenant
+        if self.tenant_id and any(doc.get("tenantId") not in (None, self.tenant_id) for doc in documents):
+            return False
+            
+        return f"User ID consistent: {self.user_id[:8]}..."
         
     def test_error_handling(self):
         """Test error handling scenarios"""
-        # Test unauthorized access
-        response = requests.get(f"{self.base_url}/api/auth/user")
+        # Test unauthorized access (drop the client's Authorization header)
+        request = self.s.build_request("GET", "/api/auth/user")
+        request.headers.pop("Authorization", None)
+        response = self.s.send(request)
         if response.status_code == 401:
             return "Unauthorized access properly blocked"
         else:
@@ -247,53 +273,55 @@ class ComprehensivePlatformTest:
         print("=" * 60)
         
         # Core system tests
-        print("\n🔐 Testing Authentication System...")
+        self._log_lines.append("\n🔐 Testing Authentication System...")
         self.run_test("Authentication System", self.test_authentication)
         
         if not self.auth_token:
-            print("❌ Authentication failed - cannot proceed with other tests")
+            self._log_lines.append("❌ Authentication failed - cannot proceed with other tests")
             return self.generate_report()
             
-        print("\n📄 Testing Document Management...")
-        self.run_test("Document Management System", self.test_document_management)
-        
-        print("\n📊 Testing Journal Entry System...")
-        self.run_test("Journal Entry System", self.test_journal_entries)
-        
-        print("\n📈 Testing Financial Reports...")
+        # Read-only tests that only need the auth token run concurrently;
+        # results are logged in submission order once each finishes
+        read_only_tests = [
+            ("📄 Testing Document Management...", "Document Management System", self.test_document_management),
+            ("📊 Testing Journal Entry System...", "Journal Entry System", self.test_journal_entries),
+            ("🔍 Testing Compliance Reports...", "Compliance Reporting System", self.test_compliance_reports),
+            ("📋 Testing Financial Statements...", "Financial Statements System", self.test_financial_statements),
+            ("📊 Testing Dashboard Statistics...", "Dashboard Statistics", self.test_dashboard_stats),
+            ("📝 Testing Audit Trail...", "Audit Trail System", self.test_audit_trail),
+            ("🏷️ Testing Classification System...", "Document Classification System", self.test_classification_system)
+        ]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [(banner, test_name, executor.submit(self._timed, test_func))
+                       for banner, test_name, test_func in read_only_tests]
+            for banner, test_name, future in futures:
+                self._log_lines.append(f"\n{banner}")
+                self._record(test_name, *future.result())
+        
+        self._log_lines.append("\n📈 Testing Financial Reports...")
         self.run_test("Financial Reporting System", self.test_financial_reports)
         
-        print("\n🔍 Testing Compliance Reports...")
-        self.run_test("Compliance Reporting System", self.test_compliance_reports)
-        
-        print("\n📋 Testing Financial Statements...")
-        self.run_test("Financial Statements System", self.test_financial_statements)
-        
-        print("\n📊 Testing Dashboard Statistics...")
-        self.run_test("Dashboard Statistics", self.test_dashboard_stats)
-        
-        print("\n📝 Testing Audit Trail...")
-        self.run_test("Audit Trail System", self.test_audit_trail)
-        
-        print("\n🤖 Testing Chat System...")
+        self._log_lines.append("\n🤖 Testing Chat System...")
         self.run_test("Conversational AI Chat System", self.test_chat_system)
         
-        print("\n🏷️ Testing Classification System...")
-        self.run_test("Document Classification System", self.test_classification_system)
-        
-        print("\n⚡ Testing API Performance...")
+        self._log_lines.append("\n⚡ Testing API Performance...")
         self.run_test("API Performance Test", self.test_api_performance)
         
-        print("\n🔒 Testing Data Integrity...")
+        self._log_lines.append("\n🔒 Testing Data Integrity...")
         self.run_test("Data Integrity Check", self.test_data_integrity)
         
-        print("\n🛠️ Testing Error Handling...")
+        self._log_lines.append("\n🛠️ Testing Error Handling...")
         self.run_test("Error Handling", self.test_error_handling)
         
         return self.generate_report()
         
     def generate_report(self):
         """Generate comprehensive test report"""
+        # Progress lines were buffered during the run; write them in one call
+        if self._log_lines:
+            sys.stdout.write("\n".join(self._log_lines) + "\n")
+            self._log_lines.clear()
+            
         print("\n" + "=" * 60)
         print("📊 COMPREHENSIVE TEST RESULTS")
         print("=" * 60)
@@ -333,8 +361,7 @@ def main():
     results = tester.run_comprehensive_test()
     
     # Save results to file
-    with open("comprehensive_test_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+    write_json_report("comprehensive_test_results.json", results)
     
     print(f"\n💾 Test results saved to comprehensive_test_results.json")
 
@@ -4,46 +4,45 @@ QRT Closure Platform - Comprehensive Test Report
 Tests all platform flows and generates a detailed report
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import numpy as np
 import sys
 from datetime import datetime
 
+from platform_test_base import BASE_URL, BaseRunner, decode_json, write_json_report
+
 # Test configuration
-BASE_URL = "http://localhost:5000"
 AUTH_TOKEN = "eyJ1c2VySWQiOiI5ZTM2YzRkYi01NmM0LTQxNzUtOTk2Mi03ZDEwM2RiMmMxY2QiLCJlbWFpbCI6InRlc3R1c2VyQGV4YW1wbGUuY29tIn0="
+# Connect fast, but give report generation time to finish
+REQUEST_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+
+# httpx sets Content-Type itself for json= bodies, so only auth is a default header
 HEADERS = {
-    "Authorization": f"Bearer {AUTH_TOKEN}",
-    "Content-Type": "application/json"
+    "Authorization": f"Bearer {AUTH_TOKEN}"
 }
 
-class ComprehensiveTestRunner:
+class ComprehensiveTestRunner(BaseRunner):
     def __init__(self):
-        self.test_results = []
+        super().__init__()
         self.failed_tests = []
         self.passed_tests = []
+        self.client = None
         
     def log_test(self, test_name, status, details="", response_data=None):
-        result = {
-            "test_name": test_name,
-            "status": status,
-            "details": details,
-            "response_data": response_data,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.test_results.append(result)
+        result = self.record_result(test_name, status=status, details=details, response_data=response_data)
         
         if status == "PASSED":
             self.passed_tests.append(result)
         else:
             self.failed_tests.append(result)
     
-    def test_authentication(self):
+    async def test_authentication(self):
         """Test authentication system"""
         try:
-            response = requests.get(f"{BASE_URL}/api/auth/user", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/auth/user")
             if response.status_code == 200:
-                data = response.json()
+                data = decode_json(response)
                 if data.get("success"):
                     self.log_test("Authentication", "PASSED", f"User authenticated: {data.get('user', {}).get('email', 'N/A')}")
                 else:
@@ -53,19 +52,19 @@ class ComprehensiveTestRunner:
         except Exception as e:
             self.log_test("Authentication", "FAILED", f"Exception: {str(e)}")
     
-    def test_document_management(self):
+    async def test_document_management(self):
         """Test document management flows"""
         try:
             # Get documents
-            response = requests.get(f"{BASE_URL}/api/documents", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/documents")
             if response.status_code == 200:
-                docs = response.json()
+                docs = decode_json(response)
                 self.log_test("Document List", "PASSED", f"Found {len(docs)} documents")
                 
                 # Test document deletion if documents exist
                 if docs:
                     doc_id = docs[0]['id']
-                    delete_response = requests.delete(f"{BASE_URL}/api/documents/{doc_id}", headers=HEADERS)
+                    delete_response = await self.client.delete(f"{BASE_URL}/api/documents/{doc_id}")
                     if delete_response.status_code == 200:
                         self.log_test("Document Deletion", "PASSED", f"Successfully deleted document {doc_id}")
                     else:
@@ -77,15 +76,19 @@ class ComprehensiveTestRunner:
         except Exception as e:
             self.log_test("Document Management", "FAILED", f"Exception: {str(e)}")
     
-    def test_financial_reporting(self):
+    async def test_financial_reporting(self):
         """Test financial reporting system"""
         try:
             # Test journal entries
-            response = requests.get(f"{BASE_URL}/api/journal-entries", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/journal-entries")
             if response.status_code == 200:
-                entries = response.json()
-                debit_total = sum(float(entry.get('debitAmount', 0)) for entry in entries)
-                credit_total = sum(float(entry.get('creditAmount', 0)) for entry in entries)
+                entries = decode_json(response)
+                # One pass builds an (n, 2) float array; NumPy converts decimal strings and sums both columns
+                amounts = np.array(
+                    [(entry.get('debitAmount', 0) or 0, entry.get('creditAmount', 0) or 0) for entry in entries],
+                    dtype=np.float64
+                ).reshape(-1, 2)
+                debit_total, credit_total = amounts.sum(axis=0)
                 balanced = abs(debit_total - credit_total) < 0.01
                 
                 self.log_test("Journal Entries", "PASSED", 
@@ -94,36 +97,38 @@ class ComprehensiveTestRunner:
                 self.log_test("Journal Entries", "FAILED", f"HTTP {response.status_code}")
             
             # Test financial statements
-            response = requests.get(f"{BASE_URL}/api/financial-statements", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/financial-statements")
             if response.status_code == 200:
-                statements = response.json()
+                statements = decode_json(response)
                 self.log_test("Financial Statements", "PASSED", f"Found {len(statements)} statements")
                 
+                # The three reports read the same period independently, so request them together
+                period = {"period": "Q3_2025"}
+                tb_response, pl_response, bs_response = await asyncio.gather(
+                    self.client.post(f"{BASE_URL}/api/reports/trial-balance", json=period),
+                    self.client.post(f"{BASE_URL}/api/reports/profit-loss", json=period),
+                    self.client.post(f"{BASE_URL}/api/reports/balance-sheet", json=period)
+                )
+                
                 # Test trial balance generation
-                tb_response = requests.post(f"{BASE_URL}/api/reports/trial-balance", 
-                    headers=HEADERS, json={"period": "Q3_2025"})
                 if tb_response.status_code == 200:
-                    tb_data = tb_response.json()
+                    tb_data = decode_json(tb_response)
                     self.log_test("Trial Balance Generation", "PASSED", 
                         f"Generated trial balance: {tb_data.get('totalDebits', 0):.2f} debits, {tb_data.get('totalCredits', 0):.2f} credits")
                 else:
                     self.log_test("Trial Balance Generation", "FAILED", f"HTTP {tb_response.status_code}")
                 
                 # Test P&L generation
-                pl_response = requests.post(f"{BASE_URL}/api/reports/profit-loss", 
-                    headers=HEADERS, json={"period": "Q3_2025"})
                 if pl_response.status_code == 200:
-                    pl_data = pl_response.json()
+                    pl_data = decode_json(pl_response)
                     self.log_test("Profit & Loss Generation", "PASSED", 
                         f"Generated P&L: Revenue {pl_data.get('totalRevenue', 0):.2f}, Expenses {pl_data.get('totalExpenses', 0):.2f}, Net Profit {pl_data.get('netProfit', 0):.2f}")
                 else:
                     self.log_test("Profit & Loss Generation", "FAILED", f"HTTP {pl_response.status_code}")
                 
                 # Test Balance Sheet generation
-                bs_response = requests.post(f"{BASE_URL}/api/reports/balance-sheet", 
-                    headers=HEADERS, json={"period": "Q3_2025"})
                 if bs_response.status_code == 200:
-                    bs_data = bs_response.json()
+                    bs_data = decode_json(bs_response)
                     self.log_test("Balance Sheet Generation", "PASSED", 
                         f"Generated Balance Sheet: Assets {bs_data.get('totalAssets', 0):.2f}, Liabilities {bs_data.get('totalLiabilities', 0):.2f}")
                 else:
@@ -133,12 +138,12 @@ class ComprehensiveTestRunner:
         except Exception as e:
             self.log_test("Financial Reporting", "FAILED", f"Exception: {str(e)}")
     
-    def test_journal_generation(self):
+    async def test_journal_generation(self):
         """Test journal entry generation with duplication check"""
         try:
-            response = requests.post(f"{BASE_URL}/api/reports/generate-journal-entries", headers=HEADERS)
+            response = await self.client.post(f"{BASE_URL}/api/reports/generate-journal-entries")
             if response.status_code == 200:
-                data = response.json()
+                data = decode_json(response)
                 self.log_test("Journal Generation", "PASSED", 
                     f"Generated {data.get('totalEntries', 0)} entries, skipped {data.get('skippedDocuments', 0)} documents")
             else:
@@ -146,12 +151,12 @@ class ComprehensiveTestRunner:
         except Exception as e:
             self.log_test("Journal Generation", "FAILED", f"Exception: {str(e)}")
     
-    def test_dashboard_stats(self):
+    async def test_dashboard_stats(self):
         """Test dashboard statistics"""
         try:
-            response = requests.get(f"{BASE_URL}/api/dashboard/stats", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/dashboard/stats")
             if response.status_code == 200:
-                stats = response.json()
+                stats = decode_json(response)
                 self.log_test("Dashboard Stats", "PASSED", 
                     f"Docs: {stats.get('documentsProcessed', 0)}, Agents: {stats.get('activeAgents', 0)}, Issues: {stats.get('complianceIssues', 0)}")
             else:
@@ -159,56 +164,68 @@ class ComprehensiveTestRunner:
         except Exception as e:
             self.log_test("Dashboard Stats", "FAILED", f"Exception: {str(e)}")
     
-    def test_compliance_system(self):
+    async def test_compliance_system(self):
         """Test compliance checking system"""
         try:
-            response = requests.get(f"{BASE_URL}/api/compliance-checks", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/compliance-checks")
             if response.status_code == 200:
-                checks = response.json()
+                checks = decode_json(response)
                 self.log_test("Compliance Checks", "PASSED", f"Found {len(checks)} compliance checks")
             else:
                 self.log_test("Compliance Checks", "FAILED", f"HTTP {response.status_code}")
         except Exception as e:
             self.log_test("Compliance System", "FAILED", f"Exception: {str(e)}")
     
-    def test_audit_trail(self):
+    async def test_audit_trail(self):
         """Test audit trail system"""
         try:
-            response = requests.get(f"{BASE_URL}/api/audit-trail", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/audit-trail")
             if response.status_code == 200:
-                trail = response.json()
+                trail = decode_json(response)
                 self.log_test("Audit Trail", "PASSED", f"Found {len(trail)} audit entries")
             else:
                 self.log_test("Audit Trail", "FAILED", f"HTTP {response.status_code}")
         except Exception as e:
             self.log_test("Audit Trail", "FAILED", f"Exception: {str(e)}")
     
-    def test_extracted_data(self):
+    async def test_extracted_data(self):
         """Test extracted data system"""
         try:
-            response = requests.get(f"{BASE_URL}/api/extracted-data", headers=HEADERS)
+            response = await self.client.get(f"{BASE_URL}/api/extracted-data")
             if response.status_code == 200:
-                data = response.json()
+                data = decode_json(response)
                 self.log_test("Extracted Data", "PASSED", f"Found {len(data)} extracted data records")
             else:
                 self.log_test("Extracted Data", "FAILED", f"HTTP {response.status_code}")
         except Exception as e:
             self.log_test("Extracted Data", "FAILED", f"Exception: {str(e)}")
     
-    def run_comprehensive_test(self):
+    async def _run_stateful_tests(self):
+        """Run the tests that delete or generate data, in order"""
+        await self.test_document_management()
+        await self.test_financial_reporting()
+        await self.test_journal_generation()
+    
+    async def run_comprehensive_test(self):
         """Run all comprehensive tests"""
         print("🧪 Starting Comprehensive Platform Testing...")
         print("=" * 60)
         
-        # Run all tests
-        self.test_authentication()
-        self.test_document_management()
-        self.test_financial_reporting()
-        self.test_journal_generation()
-        self.test_dashboard_stats()
-        self.test_compliance_system()
-        self.test_audit_trail()
-        self.test_extracted_data()
+        limits = httpx.Limits(max_connections=20, keepalive_expiry=30)
+        # httpx retries only failed connects, which is safe for every method here
+        transport = httpx.AsyncHTTPTransport(retries=2, limits=limits)
+        async with httpx.AsyncClient(headers=HEADERS, transport=transport,
+                                     timeout=REQUEST_TIMEOUT) as self.client:
+            await self.test_authentication()
+            
+            # Read-only probes share the event loop with the sequential stateful chain
+            await asyncio.gather(
+                self._run_stateful_tests(),
+                self.test_dashboard_stats(),
+                self.test_compliance_system(),
+                self.test_audit_trail(),
+                self.test_extracted_data()
+            )
         
         # Generate summary report
         self.generate_summary_report()
@@ -282,11 +299,10 @@ class ComprehensiveTestRunner:
             "failed_tests": self.failed_tests
         }
         
-        with open("comprehensive_test_report.json", "w") as f:
-            json.dump(report_data, f, indent=2)
+        write_json_report("comprehensive_test_report.json", report_data)
         
         print(f"📄 Detailed report saved to: comprehensive_test_report.json")
 
 if __name__ == "__main__":
     runner = ComprehensiveTestRunner()
-    runner.run_comprehensive_test()
\ No newline at end of file
+    asyncio.run(runner.run_comprehensive_test())
\ No newline at end of file
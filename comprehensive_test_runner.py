@@ -6,14 +6,111 @@ Executes all user scenarios with the generated test dataset
 
 import json
 import time
-import requests
+import httpx
 import pandas as pd
 from typing import Dict, List, Any
 from datetime import datetime
 import os
 import asyncio
 import concurrent.futures
+import functools
+from collections import Counter
+import io
+import uuid
 from pathlib import Path
+from platform_test_base import decode_json, orjson
+
+# API endpoints, relative to the client's base_url
+AUTH_USER_URL = "/api/auth/user"
+DOCUMENTS_URL = "/api/documents"
+UPLOAD_URL = "/api/documents/upload"
+AGENT_CHAT_URL = "/api/agent-chat/start"
+BATCH_REPORTS_URL = "/api/reports/batch"
+EXTRACTED_DATA_URL = "/api/extracted-data"
+COMPLIANCE_URL = "/api/compliance-checks"
+DASHBOARD_URL = "/api/dashboard/stats"
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+REQUEST_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+REPORT_PATH = "test_data/comprehensive_test_report.json"
+RESULTS_LOG_PATH = "test_data/comprehensive_test_results.jsonl"
+
+# Categories reported in test_categories, in report order
+REPORT_CATEGORIES = [
+    "document_upload",
+    "ai_workflows",
+    "financial_reports",
+    "compliance_checks",
+    "performance_tests",
+    "error_handling",
+    "data_extraction",
+    "user_workflows"
+]
+
+def multipart_file_stream(field: str, file_path: str, boundary: str):
+    """Yield a multipart/form-data body for one file, reading it in 64KB chunks"""
+    filename = os.path.basename(file_path)
+    yield (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode()
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport that retries idempotent requests on transient status codes with exponential backoff"""
+    
+    def __init__(self, total: int = 2, backoff_factor: float = 0.1, **kwargs):
+        super().__init__(**kwargs)
+        self.total = total
+        self.backoff_factor = backoff_factor
+    
+    def _delay(self, response, attempt: int) -> float:
+        """Honour a numeric Retry-After header, otherwise back off exponentially"""
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * (2 ** attempt)
+    
+    def handle_request(self, request):
+        # A POST may already have been committed when the gateway error came back, and streamed
+        # bodies (the chunked uploads) cannot be replayed, so only retry buffered idempotent requests
+        retryable = request.method in IDEMPOTENT_METHODS and isinstance(request.stream, httpx.ByteStream)
+        attempts = self.total + 1 if retryable else 1
+        for attempt in range(attempts):
+            response = super().handle_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                return response
+            delay = self._delay(response, attempt)
+            response.close()
+            time.sleep(delay)
+
+class AuthExpired(Exception):
+    """Raised by the client hook when an authenticated request comes back 401 or 403.
+
+    The per-test handlers re-raise it, so run_all_tests can stop the run
+    instead of logging one failure per remaining test.
+    """
+
+def run_once(method):
+    """Skip a test category that has already run, keeping the results of its first run"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        name = method.__name__
+        if name in self._ran:
+            return
+        self._ran[name] = []
+        before = len(self.test_results)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._ran[name] = self.test_results[before:]
+    return wrapper
 
 class ComprehensiveTestRunner:
     """Run comprehensive tests for all user scenarios"""
@@ -24,22 +121,85 @@ class ComprehensiveTestRunner:
         self.test_results = []
         self.auth_token = None
         self.user_id = None
+        self._ran = {}
+        self._get_cache = {}
+        self._test_data_listing = None
+        
+        # One pooled client for the whole run so connections are reused
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            timeout=REQUEST_TIMEOUT,
+            transport=RetryTransport(retries=3, limits=limits),
+            event_hooks={"response": [self._check_auth]}
+        )
+        
+        # Each result is appended as one JSON line, so an interrupted run still leaves its results
+        os.makedirs(os.path.dirname(RESULTS_LOG_PATH), exist_ok=True)
+        self._results_log = open(RESULTS_LOG_PATH, "w", buffering=1)
         
-    def log_test_result(self, test_name: str, passed: bool, details: str = "", duration: float = 0):
-        """Log test result with timestamp"""
+    def log_test_result(self, test_name: str, passed: bool, details: str = "", duration: float = 0, category: str = None):
+        """Log test result with a raw nanosecond timestamp"""
         result = {
             "test_name": test_name,
             "passed": passed,
             "details": details,
             "duration": duration,
-            "timestamp": datetime.now().isoformat()
+            "category": category,
+            "ts_ns": time.time_ns()
         }
         self.test_results.append(result)
+        self._results_log.write(json.dumps(result) + "\n")
         status = "✅ PASS" if passed else "❌ FAIL"
         print(f"{status} {test_name} ({duration:.2f}s)")
         if details:
             print(f"   Details: {details}")
     
+    def close(self):
+        """Release the HTTP client and the results log"""
+        self.client.close()
+        self._results_log.close()
+    
+    def _gather(self, scenario, items, category: str):
+        """Run one scenario per item concurrently and log the results in order"""
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+            for result in executor.map(scenario, items):
+                self.log_test_result(*result, category=category)
+    
+    @staticmethod
+    def _cache_key(url: str, params: Dict[str, str] = None):
+        """Key for an idempotent GET: URL plus sorted query params"""
+        return url, tuple(sorted((params or {}).items()))
+    
+    def _cached_get(self, url: str, params: Dict[str, str] = None, decode: bool = True):
+        """GET an idempotent endpoint once per run and return (status_code, json_body).
+
+        The body is decoded on first use, so status-only callers pass decode=False
+        and never parse it.
+        """
+        key = self._cache_key(url, params)
+        entry = self._get_cache.get(key)
+        if entry is None:
+            response = self.client.get(url, params=params)
+            if response.status_code != 200:
+                return response.status_code, None
+            entry = self._get_cache[key] = {"status": response.status_code, "response": response}
+        
+        if not decode:
+            return entry["status"], None
+        if "body" not in entry:
+            entry["body"] = decode_json(entry["response"])
+        return entry["status"], entry["body"]
+    
+    def has_cache(self, url: str, params: Dict[str, str] = None) -> bool:
+        """Check whether a GET is already cached without touching the network"""
+        return self._cache_key(url, params) in self._get_cache
+    
+    def _check_auth(self, response):
+        """Client response hook: stop the run once an authenticated request is rejected"""
+        if response.status_code in (401, 403) and response.request.headers.get("Authorization"):
+            raise AuthExpired(response.url)
+    
     def setup_authentication(self):
         """Setup authentication for testing"""
         try:
@@ -47,19 +207,23 @@ class ComprehensiveTestRunner:
             self.auth_token = "eyJ1c2VySWQiOiI5ZTM2YzRkYi01NmM0LTQxNzUtOTk2Mi03ZDEwM2RiMmMxY2QiLCJlbWFpbCI6InRlc3R1c2VyQGV4YW1wbGUuY29tIn0="
             self.user_id = "9e36c4db-56c4-4175-9962-7d103db2c1cd"
             
+            self.client.headers["Authorization"] = f"Bearer {self.auth_token}"
+            
             # Verify authentication
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.get(f"{self.base_url}/api/auth/user", headers=headers)
+            status_code, _ = self._cached_get(AUTH_USER_URL, decode=False)
             
-            if response.status_code == 200:
+            if status_code == 200:
                 return True
             else:
                 return False
                 
+        except AuthExpired:
+            return False
         except Exception as e:
             print(f"Authentication setup failed: {e}")
             return False
     
+    @run_once
     def test_document_upload_scenarios(self):
         """Test all document upload scenarios"""
         print("\n🚀 Testing Document Upload Scenarios...")
@@ -74,79 +238,88 @@ class ComprehensiveTestRunner:
             "test_data/purchase_register_comprehensive.csv"
         ]
         
-        for file_path in test_files:
-            if os.path.exists(file_path):
-                start_time = time.time()
-                success = self.upload_test_file(file_path)
-                duration = time.time() - start_time
-                
-                self.log_test_result(
-                    f"Upload {os.path.basename(file_path)}",
-                    success,
-                    f"File uploaded and processed" if success else "Upload failed",
-                    duration
-                )
-            else:
-                self.log_test_result(
-                    f"Upload {os.path.basename(file_path)}",
-                    False,
-                    "File not found",
-                    0
-                )
+        self._gather(self._upload_one, test_files, "document_upload")
+    
+    def _upload_one(self, file_path: str):
+        """Upload one test file and return its result fields"""
+        filename = os.path.basename(file_path)
+        name = f"Upload {filename}"
+        if filename not in self._test_data_files():
+            return name, False, "File not found", 0
+        
+        start_time = time.perf_counter()
+        success = self.upload_test_file(file_path)
+        duration = time.perf_counter() - start_time
+        
+        return name, success, "File uploaded and processed" if success else "Upload failed", duration
+    
+    def _test_data_files(self) -> set:
+        """Names of the files in test_data/, listed with one scandir per runner"""
+        if self._test_data_listing is None:
+            try:
+                with os.scandir("test_data") as entries:
+                    self._test_data_listing = {entry.name for entry in entries}
+            except FileNotFoundError:
+                self._test_data_listing = set()
+        return self._test_data_listing
     
     def upload_test_file(self, file_path: str) -> bool:
         """Upload a test file"""
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            
-            with open(file_path, 'rb') as f:
-                files = {'file': f}
-                response = requests.post(
-                    f"{self.base_url}/api/documents/upload",
-                    headers=headers,
-                    files=files,
-                    timeout=60
-                )
+            # Stream the body from disk instead of buffering the whole file
+            boundary = uuid.uuid4().hex
+            response = self.client.post(
+                UPLOAD_URL,
+                content=multipart_file_stream('file', file_path, boundary),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+                timeout=REQUEST_TIMEOUT
+            )
             
             return response.status_code == 200
             
+        except AuthExpired:
+            raise
         except Exception as e:
             print(f"Upload failed: {e}")
             return False
     
+    @run_once
     def test_ai_agent_workflows(self):
         """Test AI agent workflows"""
         print("\n🤖 Testing AI Agent Workflows...")
         
         # Test agent chat
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.post(
-                f"{self.base_url}/api/agent-chat/start",
-                headers=headers,
+            response = self.client.post(
+                AGENT_CHAT_URL,
                 json={"message": "Process all uploaded documents"},
                 timeout=30
             )
             
             success = response.status_code == 200
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "AI Agent Chat Workflow",
                 success,
                 "Agent chat initiated successfully" if success else "Agent chat failed",
-                duration
+                duration,
+                category="ai_workflows"
             )
             
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "AI Agent Chat Workflow",
                 False,
                 f"Error: {str(e)}",
-                time.time() - start_time
+                time.perf_counter() - start_time,
+                category="ai_workflows"
             )
     
+    @run_once
     def test_financial_reporting(self):
         """Test financial report generation"""
         print("\n📊 Testing Financial Reporting...")
@@ -158,105 +331,116 @@ class ComprehensiveTestRunner:
             ("cash_flow", "Cash Flow")
         ]
         
+        start_time = time.perf_counter()
+        try:
+            results = self._batch_reports(report_types)
+        except AuthExpired:
+            raise
+        except Exception as e:
+            self.log_test_result(
+                "Financial Reporting",
+                False,
+                f"Error: {str(e)}",
+                time.perf_counter() - start_time,
+                category="financial_reports"
+            )
+            return
+        
+        duration = time.perf_counter() - start_time
         for report_type, report_name in report_types:
-            start_time = time.time()
-            try:
-                headers = {"Authorization": f"Bearer {self.auth_token}"}
-                response = requests.post(
-                    f"{self.base_url}/api/reports/{report_type}",
-                    headers=headers,
-                    json={"period": "Q3_2025"},
-                    timeout=30
-                )
-                
-                success = response.status_code == 200
-                duration = time.time() - start_time
-                
-                self.log_test_result(
-                    f"Generate {report_name}",
-                    success,
-                    f"{report_name} generated successfully" if success else f"{report_name} generation failed",
-                    duration
-                )
-                
-            except Exception as e:
-                self.log_test_result(
-                    f"Generate {report_name}",
-                    False,
-                    f"Error: {str(e)}",
-                    time.time() - start_time
-                )
+            result = results.get(report_type)
+            success = result is not None and not (isinstance(result, dict) and result.get("error"))
+            self.log_test_result(
+                f"Generate {report_name}",
+                success,
+                f"{report_name} generated successfully" if success else f"{report_name} generation failed",
+                duration,
+                category="financial_reports"
+            )
     
+    def _batch_reports(self, report_types):
+        """Request every report type in one call and return the results keyed by type"""
+        response = self.client.post(
+            BATCH_REPORTS_URL,
+            json={"period": "Q3_2025", "reports": [report_type for report_type, _ in report_types]},
+            timeout=60
+        )
+        if response.status_code != 200:
+            return {}
+        
+        results = decode_json(response)
+        return results if isinstance(results, dict) else {}
+    
+    @run_once
     def test_compliance_validation(self):
         """Test compliance validation scenarios"""
         print("\n🔍 Testing Compliance Validation...")
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            
             # Test GST compliance
-            start_time = time.time()
-            response = requests.get(f"{self.base_url}/api/compliance-checks", headers=headers)
+            start_time = time.perf_counter()
+            status_code, _ = self._cached_get(COMPLIANCE_URL, decode=False)
             
-            success = response.status_code == 200
-            duration = time.time() - start_time
+            success = status_code == 200
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "GST Compliance Check",
                 success,
                 "Compliance checks retrieved" if success else "Compliance check failed",
-                duration
+                duration,
+                category="compliance_checks"
             )
             
             # Test creating compliance check
-            start_time = time.time()
-            response = requests.post(
-                f"{self.base_url}/api/compliance-checks",
-                headers=headers,
+            start_time = time.perf_counter()
+            response = self.client.post(
+                COMPLIANCE_URL,
                 json={"document_id": "test-doc-id"},
                 timeout=30
             )
             
             success = response.status_code in [200, 201]
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "Create Compliance Check",
                 success,
                 "Compliance check created" if success else "Compliance check creation failed",
-                duration
+                duration,
+                category="compliance_checks"
             )
             
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Compliance Validation",
                 False,
                 f"Error: {str(e)}",
-                0
+                0,
+                category="compliance_checks"
             )
     
+    @run_once
     def test_data_extraction_scenarios(self):
         """Test data extraction for different document types"""
         print("\n🔍 Testing Data Extraction Scenarios...")
         
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            
             # Test extracted data retrieval
-            start_time = time.time()
-            response = requests.get(
-                f"{self.base_url}/api/extracted-data",
-                headers=headers,
+            start_time = time.perf_counter()
+            status_code, data = self._cached_get(
+                EXTRACTED_DATA_URL,
                 params={"period": "Q3_2025", "docType": "all"}
             )
             
-            success = response.status_code == 200
-            duration = time.time() - start_time
+            success = status_code == 200
+            duration = time.perf_counter() - start_time
             
+            documents = data.get("extractedData", []) if isinstance(data, dict) else (data or [])
             if success:
-                data = response.json()
-                extracted_count = len(data)
-                details = f"Extracted data from {extracted_count} documents"
+                details = f"Extracted data from {len(documents)} documents"
             else:
                 details = "Data extraction failed"
             
@@ -264,77 +448,77 @@ class ComprehensiveTestRunner:
                 "Data Extraction - All Documents",
                 success,
                 details,
-                duration
+                duration,
+                category="data_extraction"
             )
             
-            # Test specific document type extraction
-            doc_types = ["vendor_invoice", "sales_register", "salary_register", "bank_statement"]
-            
-            for doc_type in doc_types:
-                start_time = time.time()
-                response = requests.get(
-                    f"{self.base_url}/api/extracted-data",
-                    headers=headers,
-                    params={"period": "Q3_2025", "docType": doc_type}
-                )
-                
-                success = response.status_code == 200
-                duration = time.time() - start_time
+            # Check each document type against the per-document types in the same response
+            if success:
+                doc_types = ["vendor_invoice", "sales_register", "salary_register", "bank_statement"]
+                type_counts = Counter(doc.get("documentType") for doc in documents if isinstance(doc, dict))
                 
-                self.log_test_result(
-                    f"Data Extraction - {doc_type}",
-                    success,
-                    f"Extracted {doc_type} data" if success else f"Failed to extract {doc_type} data",
-                    duration
-                )
+                for doc_type in doc_types:
+                    found = type_counts[doc_type]
+                    self.log_test_result(
+                        f"Data Extraction - {doc_type}",
+                        found > 0,
+                        f"Extracted {found} {doc_type} documents" if found else f"No {doc_type} documents extracted",
+                        duration,
+                        category="data_extraction"
+                    )
                 
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Data Extraction Test",
                 False,
                 f"Error: {str(e)}",
-                0
+                0,
+                category="data_extraction"
             )
     
+    @run_once
     def test_performance_scenarios(self):
         """Test performance with different loads"""
         print("\n⚡ Testing Performance Scenarios...")
         
         # Test dashboard stats (should be fast)
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.get(f"{self.base_url}/api/dashboard/stats", headers=headers)
+            status_code, _ = self._cached_get(DASHBOARD_URL, decode=False)
             
-            success = response.status_code == 200
-            duration = time.time() - start_time
+            success = status_code == 200
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "Dashboard Performance",
                 success,
                 f"Dashboard loaded in {duration:.2f}s" if success else "Dashboard load failed",
-                duration
+                duration,
+                category="performance_tests"
             )
             
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Dashboard Performance",
                 False,
                 f"Error: {str(e)}",
-                time.time() - start_time
+                time.perf_counter() - start_time,
+                category="performance_tests"
             )
         
         # Test document listing performance
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            response = requests.get(f"{self.base_url}/api/documents", headers=headers)
+            status_code, documents = self._cached_get(DOCUMENTS_URL)
             
-            success = response.status_code == 200
-            duration = time.time() - start_time
+            success = status_code == 200
+            duration = time.perf_counter() - start_time
             
             if success:
-                documents = response.json()
                 doc_count = len(documents)
                 details = f"Listed {doc_count} documents in {duration:.2f}s"
             else:
@@ -344,82 +528,87 @@ class ComprehensiveTestRunner:
                 "Document Listing Performance",
                 success,
                 details,
-                duration
+                duration,
+                category="performance_tests"
             )
             
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Document Listing Performance",
                 False,
                 f"Error: {str(e)}",
-                time.time() - start_time
+                time.perf_counter() - start_time,
+                category="performance_tests"
             )
     
+    @run_once
     def test_error_handling_scenarios(self):
         """Test error handling scenarios"""
         print("\n🛠️ Testing Error Handling Scenarios...")
         
         # Test invalid file upload
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            headers = {"Authorization": f"Bearer {self.auth_token}"}
-            
-            # Create a small test file with invalid content
-            with open("test_invalid.txt", "w") as f:
-                f.write("This is not a valid financial document")
-            
-            with open("test_invalid.txt", "rb") as f:
-                files = {'file': f}
-                response = requests.post(
-                    f"{self.base_url}/api/documents/upload",
-                    headers=headers,
-                    files=files,
-                    timeout=30
-                )
+            # Upload invalid content straight from memory
+            files = {'file': ('test_invalid.txt', io.BytesIO(b"This is not a valid financial document"), 'text/plain')}
+            response = self.client.post(
+                UPLOAD_URL,
+                files=files,
+                timeout=30
+            )
             
             # Should either succeed (and handle gracefully) or fail with proper error
             success = response.status_code in [200, 400]
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "Invalid File Upload Handling",
                 success,
                 "Error handled gracefully" if success else "Error handling failed",
-                duration
+                duration,
+                category="error_handling"
             )
             
-            # Cleanup
-            os.remove("test_invalid.txt")
-            
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Invalid File Upload Handling",
                 False,
                 f"Error: {str(e)}",
-                time.time() - start_time
+                time.perf_counter() - start_time,
+                category="error_handling"
             )
         
         # Test unauthorized access
-        start_time = time.time()
+        start_time = time.perf_counter()
         try:
-            response = requests.get(f"{self.base_url}/api/documents")  # No auth header
+            request = self.client.build_request("GET", DOCUMENTS_URL)
+            request.headers.pop("Authorization", None)  # No auth header
+            response = self.client.send(request)
             
             success = response.status_code == 401
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             
             self.log_test_result(
                 "Unauthorized Access Handling",
                 success,
                 "Unauthorized access properly blocked" if success else "Security issue detected",
-                duration
+                duration,
+                category="error_handling"
             )
             
+        except AuthExpired:
+            raise
         except Exception as e:
             self.log_test_result(
                 "Unauthorized Access Handling",
                 False,
                 f"Error: {str(e)}",
-                time.time() - start_time
+                time.perf_counter() - start_time,
+                category="error_handling"
             )
     
     def test_user_workflow_scenarios(self):
@@ -435,41 +624,73 @@ class ComprehensiveTestRunner:
             ("Compliance Validation", self.test_compliance_validation)
         ]
         
-        overall_start = time.time()
+        overall_start = time.perf_counter()
         workflow_success = True
         
         for step_name, step_function in workflow_steps:
             try:
-                step_start = time.time()
+                step_start = time.perf_counter()
                 step_function()
-                step_duration = time.time() - step_start
+                step_duration = time.perf_counter() - step_start
                 
                 # Check if this step had any failures
-                recent_results = [r for r in self.test_results if r["timestamp"] >= datetime.now().replace(microsecond=0).isoformat()]
-                step_passed = all(r["passed"] for r in recent_results[-5:])  # Check last 5 results
+                step_passed = all(r["passed"] for r in self._ran[step_function.__name__])
                 
                 if not step_passed:
                     workflow_success = False
                     
+            except AuthExpired:
+                raise
             except Exception as e:
                 workflow_success = False
                 print(f"Workflow step {step_name} failed: {e}")
         
-        overall_duration = time.time() - overall_start
+        overall_duration = time.perf_counter() - overall_start
         
         self.log_test_result(
             "Complete Quarterly Closure Workflow",
             workflow_success,
             "Full workflow completed successfully" if workflow_success else "Workflow had failures",
-            overall_duration
+            overall_duration,
+            category="user_workflows"
         )
     
+    def _tally(self) -> Dict[str, Any]:
+        """Collect report counts and recommendation flags in one pass over the results"""
+        categories = Counter()
+        passed = 0
+        slow = upload_failed = ai_failed = False
+        
+        for r in self.test_results:
+            category = r["category"]
+            categories[category] += 1
+            if r["passed"]:
+                passed += 1
+            else:
+                upload_failed = upload_failed or category == "document_upload"
+                ai_failed = ai_failed or category == "ai_workflows"
+            slow = slow or r["duration"] > 10
+        
+        return {
+            "passed": passed,
+            "categories": {category: categories[category] for category in REPORT_CATEGORIES},
+            "slow": slow,
+            "upload_failed": upload_failed,
+            "ai_failed": ai_failed
+        }
+    
     def generate_test_report(self):
         """Generate comprehensive test report"""
         print("\n📋 Generating Test Report...")
         
+        # Timestamps are recorded raw and only formatted for the report
+        for r in self.test_results:
+            if "timestamp" not in r:
+                r["timestamp"] = datetime.fromtimestamp(r["ts_ns"] / 1e9).isoformat()
+        
+        tally = self._tally()
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r["passed"])
+        passed_tests = tally["passed"]
         failed_tests = total_tests - passed_tests
         
         success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
@@ -482,49 +703,56 @@ class ComprehensiveTestRunner:
                 "failed_tests": failed_tests,
                 "success_rate": f"{success_rate:.1f}%"
             },
-            "test_categories": {
-                "document_upload": len([r for r in self.test_results if "Upload" in r["test_name"]]),
-                "ai_workflows": len([r for r in self.test_results if "AI" in r["test_name"]]),
-                "financial_reports": len([r for r in self.test_results if "Generate" in r["test_name"]]),
-                "compliance_checks": len([r for r in self.test_results if "Compliance" in r["test_name"]]),
-                "performance_tests": len([r for r in self.test_results if "Performance" in r["test_name"]]),
-                "error_handling": len([r for r in self.test_results if "Handling" in r["test_name"]])
-            },
+            "test_categories": tally["categories"],
+            "results_log": RESULTS_LOG_PATH,
             "detailed_results": self.test_results,
-            "recommendations": self.generate_recommendations()
+            "recommendations": self.generate_recommendations(tally)
         }
         
-        with open("test_data/comprehensive_test_report.json", "w") as f:
-            json.dump(report, f, indent=2)
+        if orjson is not None:
+            with open(REPORT_PATH, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(REPORT_PATH, "w") as f:
+                for chunk in json.JSONEncoder(indent=2).iterencode(report):
+                    f.write(chunk)
         
         print(f"✅ Test Report Generated")
         print(f"📊 Results: {passed_tests}/{total_tests} tests passed ({success_rate:.1f}%)")
         
         return report
     
-    def generate_recommendations(self) -> List[str]:
+    def generate_recommendations(self, tally: Dict[str, Any] = None) -> List[str]:
         """Generate recommendations based on test results"""
+        if tally is None:
+            tally = self._tally()
         recommendations = []
         
-        failed_tests = [r for r in self.test_results if not r["passed"]]
-        
-        if failed_tests:
+        if tally["passed"] < len(self.test_results):
             recommendations.append("Review failed test cases and implement fixes")
         
-        slow_tests = [r for r in self.test_results if r["duration"] > 10]
-        if slow_tests:
+        if tally["slow"]:
             recommendations.append("Optimize performance for slow operations")
         
-        upload_failures = [r for r in failed_tests if "Upload" in r["test_name"]]
-        if upload_failures:
+        if tally["upload_failed"]:
             recommendations.append("Improve file upload error handling and validation")
         
-        ai_failures = [r for r in failed_tests if "AI" in r["test_name"]]
-        if ai_failures:
+        if tally["ai_failed"]:
             recommendations.append("Implement better AI service error handling and fallbacks")
         
         return recommendations
     
+    def _run_categories(self):
+        """Run every test category in order"""
+        self.test_document_upload_scenarios()
+        self.test_ai_agent_workflows()
+        self.test_data_extraction_scenarios()
+        self.test_financial_reporting()
+        self.test_compliance_validation()
+        self.test_performance_scenarios()
+        self.test_error_handling_scenarios()
+        self.test_user_workflow_scenarios()
+    
     def run_all_tests(self):
         """Run all comprehensive tests"""
         print("🚀 Starting Comprehensive Test Suite...")
@@ -533,29 +761,25 @@ class ComprehensiveTestRunner:
         # Setup
         if not self.setup_authentication():
             print("❌ Authentication setup failed. Cannot proceed with tests.")
+            self.close()
             return
         
         print("✅ Authentication setup successful")
         
-        # Run all test categories
+        # Run all test categories, stopping as soon as the fixed test token is rejected
         try:
-            self.test_document_upload_scenarios()
-            self.test_ai_agent_workflows()
-            self.test_data_extraction_scenarios()
-            self.test_financial_reporting()
-            self.test_compliance_validation()
-            self.test_performance_scenarios()
-            self.test_error_handling_scenarios()
-            self.test_user_workflow_scenarios()
-            
+            self._run_categories()
+        except AuthExpired:
+            print("❌ Authentication rejected mid-run. Skipping remaining tests.")
         except Exception as e:
             print(f"❌ Test execution failed: {e}")
         
         # Generate report
         report = self.generate_test_report()
+        self.close()
         
         print("\n🎯 Test Suite Complete!")
-        print(f"📋 Full report saved to: test_data/comprehensive_test_report.json")
+        print(f"📋 Full report saved to: {REPORT_PATH}")
         
         return report
 
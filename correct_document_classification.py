@@ -4,6 +4,8 @@ Correct document classification and regenerate journal entries with proper accou
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime
 
@@ -16,9 +18,17 @@ headers = {
     "Content-Type": "application/json"
 }
 
+# One pooled session for every call; retry transient gateway errors instead of failing the whole correction run
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=20, max_retries=Retry(
+    total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["GET", "DELETE"])
+)))
+
 def get_documents():
     """Get all documents"""
-    response = requests.get(f"{BASE_URL}/api/documents", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/api/documents")
     if response.status_code == 200:
         return response.json()
     else:
@@ -29,21 +39,26 @@ def clear_existing_journal_entries():
     """Clear existing journal entries to regenerate with correct classification"""
     print("Clearing existing journal entries...")
     
-    # Get all journal entries
-    response = requests.get(f"{BASE_URL}/api/journal-entries", headers=headers)
+    # One request clears every entry for the tenant
+    response = SESSION.delete(f"{BASE_URL}/api/journal-entries/clear")
     if response.status_code == 200:
-        entries = response.json()
-        print(f"Found {len(entries)} journal entries to clear")
-        
-        # Delete each entry
-        for entry in entries:
-            delete_response = requests.delete(f"{BASE_URL}/api/journal-entries/{entry['id']}", headers=headers)
-            if delete_response.status_code == 200:
-                print(f"Deleted journal entry {entry['id']}")
-            else:
-                print(f"Failed to delete journal entry {entry['id']}: {delete_response.status_code}")
+        print(f"Deleted {response.json().get('deletedCount', 0)} journal entries")
     else:
-        print(f"Error fetching journal entries: {response.status_code}")
+        print(f"Error clearing journal entries: {response.status_code}")
+
+def balanced_entries(doc_id, reference, narration, debit_account, credit_account, amount):
+    """Build the debit and credit lines for one corrected document"""
+    common = {
+        "documentId": doc_id,
+        "date": "2025-04-15T00:00:00Z",
+        "narration": narration
+    }
+    return [
+        {**common, "journalId": f"{reference}_DR", "accountCode": debit_account[0], "accountName": debit_account[1],
+         "debitAmount": amount, "creditAmount": 0},
+        {**common, "journalId": f"{reference}_CR", "accountCode": credit_account[0], "accountName": credit_account[1],
+         "debitAmount": 0, "creditAmount": amount}
+    ]
 
 def create_corrected_journal_entries():
     """Create corrected journal entries with proper account codes"""
@@ -51,6 +66,7 @@ def create_corrected_journal_entries():
     
     # Get documents
     documents = get_documents()
+    batch = []
     
     for doc in documents:
         filename = doc['originalName']
@@ -60,111 +76,38 @@ def create_corrected_journal_entries():
         if filename == "Purchase Register.xlsx":
             # This file contains SALES data (Amount: ₹3,200,343)
             print(f"Processing {filename} as SALES data (corrected from purchase)")
-            
-            # Create sales revenue journal entry
-            journal_entry = {
-                "documentId": doc_id,
-                "entryDate": "2025-04-15T00:00:00Z",
-                "description": "Sales Revenue - Customer Transactions",
-                "reference": "SALES-2025-001",
-                "accountCode": "1200",
-                "accountName": "Accounts Receivable",
-                "debitAmount": 3200343,
-                "creditAmount": 0,
-                "metadata": {
-                    "originalAmount": 3200343,
-                    "correctedClassification": "sales_revenue"
-                }
-            }
-            
-            # Create the debit entry
-            response = requests.post(f"{BASE_URL}/api/journal-entries", 
-                                   json=journal_entry, headers=headers)
-            if response.status_code == 201:
-                print(f"Created debit entry for sales: ₹{3200343:,}")
-            else:
-                print(f"Failed to create debit entry: {response.status_code}")
-            
-            # Create corresponding credit entry
-            credit_entry = {
-                "documentId": doc_id,
-                "entryDate": "2025-04-15T00:00:00Z",
-                "description": "Sales Revenue - Customer Transactions",
-                "reference": "SALES-2025-001",
-                "accountCode": "4100",
-                "accountName": "Sales Revenue",
-                "debitAmount": 0,
-                "creditAmount": 3200343,
-                "metadata": {
-                    "originalAmount": 3200343,
-                    "correctedClassification": "sales_revenue"
-                }
-            }
-            
-            response = requests.post(f"{BASE_URL}/api/journal-entries", 
-                                   json=credit_entry, headers=headers)
-            if response.status_code == 201:
-                print(f"Created credit entry for sales: ₹{3200343:,}")
-            else:
-                print(f"Failed to create credit entry: {response.status_code}")
+            batch += balanced_entries(
+                doc_id, "SALES-2025-001", "Sales Revenue - Customer Transactions",
+                ("1200", "Accounts Receivable"), ("4100", "Sales Revenue"), 3200343
+            )
                 
         elif filename == "Sales Register.xlsx":
             # This file contains FIXED ASSETS data (Cost: ₹410,224)
             print(f"Processing {filename} as FIXED ASSETS data (corrected from sales)")
-            
-            # Create fixed assets journal entry
-            journal_entry = {
-                "documentId": doc_id,
-                "entryDate": "2025-04-15T00:00:00Z",
-                "description": "Fixed Assets Acquisition",
-                "reference": "ASSETS-2025-001",
-                "accountCode": "1500",
-                "accountName": "Fixed Assets",
-                "debitAmount": 410224,
-                "creditAmount": 0,
-                "metadata": {
-                    "originalAmount": 410224,
-                    "correctedClassification": "fixed_assets"
-                }
-            }
-            
-            # Create the debit entry
-            response = requests.post(f"{BASE_URL}/api/journal-entries", 
-                                   json=journal_entry, headers=headers)
-            if response.status_code == 201:
-                print(f"Created debit entry for fixed assets: ₹{410224:,}")
-            else:
-                print(f"Failed to create debit entry: {response.status_code}")
-            
-            # Create corresponding credit entry (assuming cash payment)
-            credit_entry = {
-                "documentId": doc_id,
-                "entryDate": "2025-04-15T00:00:00Z",
-                "description": "Fixed Assets Acquisition",
-                "reference": "ASSETS-2025-001",
-                "accountCode": "1100",
-                "accountName": "Bank Account",
-                "debitAmount": 0,
-                "creditAmount": 410224,
-                "metadata": {
-                    "originalAmount": 410224,
-                    "correctedClassification": "fixed_assets"
-                }
-            }
-            
-            response = requests.post(f"{BASE_URL}/api/journal-entries", 
-                                   json=credit_entry, headers=headers)
-            if response.status_code == 201:
-                print(f"Created credit entry for fixed assets: ₹{410224:,}")
-            else:
-                print(f"Failed to create credit entry: {response.status_code}")
+            # Credit side assumes cash payment
+            batch += balanced_entries(
+                doc_id, "ASSETS-2025-001", "Fixed Assets Acquisition",
+                ("1500", "Fixed Assets"), ("1100", "Bank Account"), 410224
+            )
+    
+    if not batch:
+        print("No misclassified documents found")
+        return
+    
+    # Create every entry in a single request
+    response = SESSION.post(f"{BASE_URL}/api/journal-entries/bulk", 
+                           json=batch)
+    if response.status_code == 201:
+        print(f"Created {len(batch)} journal entries")
+    else:
+        print(f"Failed to create journal entries: {response.status_code}")
 
 def test_corrected_pl():
     """Test the corrected P&L calculation"""
     print("\nTesting corrected P&L calculation...")
     
-    response = requests.post(f"{BASE_URL}/api/reports/profit-loss", 
-                           json={"period": "2025"}, headers=headers)
+    response = SESSION.post(f"{BASE_URL}/api/reports/profit-loss", 
+                           json={"period": "2025"})
     
     if response.status_code == 200:
         pl_data = response.json()
@@ -14,23 +14,13 @@ def create_auth_tables():
     
     # SQL to add authentication fields to existing users table
     create_tables_sql = """
-    -- Add authentication fields to existing users table
-    ALTER TABLE users 
-    ADD COLUMN IF NOT EXISTS password_hash VARCHAR;
-    
-    ALTER TABLE users 
-    ADD COLUMN IF NOT EXISTS company_name VARCHAR;
-    
-    ALTER TABLE users 
-    ADD COLUMN IF NOT EXISTS phone VARCHAR;
-    
-    ALTER TABLE users 
-    ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE;
-    
-    ALTER TABLE users 
-    ADD COLUMN IF NOT EXISTS is_verified BOOLEAN DEFAULT FALSE;
-    
+    -- Add authentication fields to existing users table (one ALTER, one lock)
     ALTER TABLE users 
+    ADD COLUMN IF NOT EXISTS password_hash VARCHAR,
+    ADD COLUMN IF NOT EXISTS company_name VARCHAR,
+    ADD COLUMN IF NOT EXISTS phone VARCHAR,
+    ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE,
+    ADD COLUMN IF NOT EXISTS is_verified BOOLEAN DEFAULT FALSE,
     ADD COLUMN IF NOT EXISTS last_login TIMESTAMP;
 
     -- Create user sessions table
@@ -53,9 +43,8 @@ def create_auth_tables():
     """
     
     try:
-        with engine.connect() as conn:
+        with engine.begin() as conn:
             conn.execute(text(create_tables_sql))
-            conn.commit()
             print("✓ Authentication tables created successfully")
     except Exception as e:
         print(f"Error creating tables: {e}")
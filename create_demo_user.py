@@ -3,15 +3,23 @@
 Create a demo user with proper tenant assignment for testing
 """
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import execute_values, RealDictCursor
 import os
 import uuid
+import base64
+import json
 from datetime import datetime
 
+# (email, first_name, last_name, company_name) for each demo user to seed
+DEMO_USERS = [
+    ("demo@example.com", "Demo", "User", "Demo Company Ltd"),
+]
+
 def create_demo_user():
     """Create a demo user with tenant assignment"""
     # Connect to database
     conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+    conn.autocommit = False
     cursor = conn.cursor(cursor_factory=RealDictCursor)
     
     try:
@@ -36,46 +44,39 @@ def create_demo_user():
                 datetime.now()
             ))
         
-        # Create a demo user with tenant assignment
-        demo_user_id = "demo_user_" + str(uuid.uuid4())[:8]
-        cursor.execute("""
+        # Upsert every demo user in one statement
+        now = datetime.now()
+        rows = [
+            ("demo_user_" + str(uuid.uuid4())[:8], email, first_name, last_name, company_name, True, tenant_id, now, now)
+            for email, first_name, last_name, company_name in DEMO_USERS
+        ]
+        users = execute_values(cursor, """
             INSERT INTO users (id, email, first_name, last_name, company_name, is_active, tenant_id, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s::uuid, %s, %s)
+            VALUES %s
             ON CONFLICT (email) DO UPDATE SET
                 tenant_id = EXCLUDED.tenant_id,
                 updated_at = EXCLUDED.updated_at
-        """, (
-            demo_user_id,
-            "demo@example.com",
-            "Demo",
-            "User",
-            "Demo Company Ltd",
-            True,
-            tenant_id,
-            datetime.now(),
-            datetime.now()
-        ))
+            RETURNING id, email
+        """, rows, template="(%s, %s, %s, %s, %s, %s, %s::uuid, %s, %s)", fetch=True)
         
         conn.commit()
         
-        # Generate JWT token for the demo user
-        import base64
-        import json
-        
-        token_payload = {
-            "userId": demo_user_id,
-            "email": "demo@example.com"
-        }
-        
-        token = base64.b64encode(json.dumps(token_payload).encode()).decode()
-        
         print(f"✅ Demo user created successfully!")
-        print(f"User ID: {demo_user_id}")
         print(f"Tenant ID: {tenant_id}")
-        print(f"Email: demo@example.com")
-        print(f"JWT Token: {token}")
-        print("\nYou can use this token to test document upload:")
-        print(f'curl -X POST http://localhost:5000/api/documents/upload -H "Authorization: Bearer {token}" -F "file=@test_file.csv"')
+        for user in users:
+            # Generate JWT token for the demo user
+            token_payload = {
+                "userId": user['id'],
+                "email": user['email']
+            }
+            
+            token = base64.b64encode(json.dumps(token_payload).encode()).decode()
+            
+            print(f"User ID: {user['id']}")
+            print(f"Email: {user['email']}")
+            print(f"JWT Token: {token}")
+            print("\nYou can use this token to test document upload:")
+            print(f'curl -X POST http://localhost:5000/api/documents/upload -H "Authorization: Bearer {token}" -F "file=@test_file.csv"')
         
     except Exception as e:
         print(f"❌ Error creating demo user: {e}")
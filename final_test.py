@@ -144,25 +144,25 @@ def start_python_server():
     # Start the server
     process = subprocess.Popen(
         [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
     )
     
-    # Wait for server to start
-    time.sleep(8)
+    # Poll server health until it answers instead of sleeping a fixed interval
+    deadline = time.monotonic() + 10
+    last_error = None
+    while time.monotonic() < deadline:
+        try:
+            response = requests.get("http://localhost:8000/api/health", timeout=0.5)
+            if response.status_code == 200:
+                print("✓ Python server started successfully")
+                return process
+        except requests.RequestException as e:
+            last_error = e
+        time.sleep(0.1)
     
-    # Check if server is running
-    try:
-        response = requests.get("http://localhost:8000/api/health", timeout=5)
-        if response.status_code == 200:
-            print("✓ Python server started successfully")
-            return process
-        else:
-            print("✗ Python server failed to start")
-            return None
-    except Exception as e:
-        print(f"✗ Python server failed to start: {e}")
-        return None
+    print(f"✗ Python server failed to start: {last_error}" if last_error else "✗ Python server failed to start")
+    return None
 
 if __name__ == "__main__":
     # Check if server is already running
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Shared plumbing for the platform test scripts
+Used by comprehensive_platform_test.py, comprehensive_test_report.py,
+comprehensive_test_runner.py and comprehensive_test_suite.py
+"""
+
+import json
+from datetime import datetime
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+BASE_URL = "http://localhost:5000"
+
+def decode_json(response):
+    """Decode a JSON response body, with orjson when it is installed"""
+    return json_loads(response.content)
+
+def write_json_report(path, data):
+    """Write data as indented JSON, with orjson when it is installed"""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+class BaseRunner:
+    """Result bookkeeping shared by the platform test runners"""
+
+    def __init__(self, base_url=BASE_URL):
+        self.base_url = base_url
+        self.test_results = []
+
+    def record_result(self, test_name, **fields):
+        """Append a timestamped result record and return it"""
+        result = {"test_name": test_name, **fields, "timestamp": datetime.now().isoformat()}
+        self.test_results.append(result)
+        return result
@@ -7,7 +7,7 @@ Easy-to-use script for running comprehensive tests with the generated dataset
 import sys
 import json
 import time
-from comprehensive_test_runner import ComprehensiveTestRunner
+from comprehensive_test_runner import AuthExpired, ComprehensiveTestRunner
 from test_dataset_generator import TestDatasetGenerator
 
 def print_banner():
@@ -98,6 +98,8 @@ def run_specific_test_category():
         
     except ValueError:
         print("❌ Invalid input. Please enter a number.")
+    except AuthExpired:
+        print("❌ Authentication rejected during the test run.")
     except Exception as e:
         print(f"❌ Test execution failed: {e}")
 
@@ -188,6 +190,8 @@ def quick_smoke_test():
         
         print(f"📊 Results: {passed_tests}/{total_tests} tests passed")
         
+    except AuthExpired:
+        print("❌ Smoke test failed: authentication rejected.")
     except Exception as e:
         print(f"❌ Smoke test failed: {e}")
     
@@ -77,6 +77,7 @@ export interface IStorage {
 
   // Journal entry operations
   createJournalEntry(entry: InsertJournalEntry): Promise<JournalEntry>;
+  createJournalEntries(entries: InsertJournalEntry[]): Promise<JournalEntry[]>;
   getJournalEntries(documentId?: string): Promise<JournalEntry[]>;
   getJournalEntriesByTenant(tenantId: string): Promise<JournalEntry[]>;
   getJournalEntriesByPeriod(period: string): Promise<JournalEntry[]>;
@@ -93,11 +94,13 @@ export interface IStorage {
   createComplianceCheck(check: InsertComplianceCheck): Promise<ComplianceCheck>;
   getComplianceChecks(documentId?: string): Promise<ComplianceCheck[]>;
   getComplianceChecksByType(type: string): Promise<ComplianceCheck[]>;
+  countComplianceChecks(tenantId: string): Promise<number>;
 
   // Audit trail operations
   createAuditTrail(trail: InsertAuditTrail): Promise<AuditTrail>;
   getAuditTrail(tenantId: string, entityId?: string): Promise<AuditTrail[]>;
   getRecentAuditTrail(tenantId: string, limit?: number): Promise<AuditTrail[]>;
+  countAuditTrail(tenantId: string): Promise<number>;
 
   // Dashboard statistics
   getDashboardStats(userId: string): Promise<{
@@ -349,6 +352,13 @@ export class DatabaseStorage implements IStorage {
     return journalEntry;
   }
 
+  async createJournalEntries(entries: InsertJournalEntry[]): Promise<JournalEntry[]> {
+    if (entries.length === 0) {
+      return [];
+    }
+    return await db.insert(journalEntries).values(entries).returning();
+  }
+
   async getJournalEntries(documentId?: string, tenantId?: string): Promise<JournalEntry[]> {
     if (documentId) {
       if (tenantId) {
@@ -516,6 +526,14 @@ export class DatabaseStorage implements IStorage {
       .orderBy(desc(complianceChecks.checkedAt));
   }
 
+  async countComplianceChecks(tenantId: string): Promise<number> {
+    const [result] = await db
+      .select({ count: count() })
+      .from(complianceChecks)
+      .where(eq(complianceChecks.tenantId, tenantId));
+    return result.count;
+  }
+
   // Audit trail operations
   async createAuditTrail(trail: InsertAuditTrail): Promise<AuditTrail> {
     const [auditTrailEntry] = await db.insert(auditTrail).values(trail).returning();
@@ -549,6 +567,14 @@ export class DatabaseStorage implements IStorage {
       .limit(limit);
   }
 
+  async countAuditTrail(tenantId: string): Promise<number> {
+    const [result] = await db
+      .select({ count: count() })
+      .from(auditTrail)
+      .where(eq(auditTrail.tenantId, tenantId));
+    return result.count;
+  }
+
   // Dashboard statistics
   async getDashboardStats(userId: string): Promise<{
     documentsProcessed: number;